@@ -1,3 +1,21 @@
-from .utils import get_manhattan_dist, get_similarity_score
+from .utils import (
+    IncrementalPairTracker,
+    get_manhattan_dist,
+    get_manhattan_dist_counting,
+    get_manhattan_dist_external,
+    get_similarity_score,
+    get_similarity_score_vectorized,
+    is_dense_range,
+    load_data_chunked,
+)
 
-__all__ = ["get_manhattan_dist", "get_similarity_score"]
+__all__ = [
+    "IncrementalPairTracker",
+    "get_manhattan_dist",
+    "get_manhattan_dist_counting",
+    "get_manhattan_dist_external",
+    "get_similarity_score",
+    "get_similarity_score_vectorized",
+    "is_dense_range",
+    "load_data_chunked",
+]
@@ -1,11 +1,51 @@
-from .utils import get_manhattan_dist, get_similarity_score
+import contextlib
+from enum import Enum
+from .utils import (
+    IncrementalPairTracker,
+    get_manhattan_dist,
+    get_manhattan_dist_counting,
+    get_manhattan_dist_external,
+    get_similarity_score,
+    get_similarity_score_vectorized,
+    is_dense_range,
+    load_data_chunked,
+)
 import pandas
+import sys
 import typer
 from typing_extensions import Annotated
 
 app = typer.Typer(help="Day 1: Historian Hysteria")
 
 
+class SimilarityEngine(str, Enum):
+    counter = "counter"
+    numpy = "numpy"
+
+
+class SortMethod(str, Enum):
+    auto = "auto"
+    comparison = "comparison"
+    counting = "counting"
+
+
+ChunkedOption = Annotated[
+    bool,
+    typer.Option(
+        "--chunked",
+        help="Parse the TSV file in fixed-size blocks into preallocated int64 arrays.",
+        is_flag=True,
+    ),
+]
+ChunkSizeOption = Annotated[
+    int, typer.Option("--chunk-size", help="Number of rows parsed per block in chunked mode.")
+]
+MemmapDirOption = Annotated[
+    str | None,
+    typer.Option("--memmap-dir", help="Directory for memory-mapped column buffers (chunked mode)."),
+]
+
+
 def load_data(file_path: str) -> pandas.DataFrame:
     """Load a TSV file into a pandas DataFrame.
 
@@ -36,15 +76,61 @@ def run_part1(
             "--sorted", help="Flag indicating the input data is already sorted.", is_flag=True
         ),
     ] = False,
+    chunked: ChunkedOption = False,
+    chunk_size: ChunkSizeOption = 1_000_000,
+    memmap_dir: MemmapDirOption = None,
+    external_sort: Annotated[
+        bool,
+        typer.Option(
+            "--external-sort",
+            help="Sort columns out of core via temporary run files for inputs larger than memory.",
+            is_flag=True,
+        ),
+    ] = False,
+    run_size: Annotated[
+        int, typer.Option("--run-size", help="Number of rows sorted in memory per spilled run.")
+    ] = 10_000_000,
+    tmp_dir: Annotated[
+        str | None, typer.Option("--tmp-dir", help="Directory for external sort run files.")
+    ] = None,
+    sort_method: Annotated[
+        SortMethod,
+        typer.Option(
+            "--sort-method",
+            help=(
+                "Sorting strategy for in-memory modes. 'counting' replaces the sort with "
+                "histograms over the value range; 'auto' uses it when the range is dense."
+            ),
+        ),
+    ] = SortMethod.auto,
 ):
     """Calculate the Manhattan distance between two integer series from a TSV file."""
-    dataset = load_data(data_file)
-    series1 = dataset.iloc[:, 0].copy(deep=True)
-    series2 = dataset.iloc[:, 1].copy(deep=True)
-    if not is_sorted:
-        series1.sort_values(inplace=True, ignore_index=True)
-        series2.sort_values(inplace=True, ignore_index=True)
-    distance = get_manhattan_dist(series1, series2)
+    if external_sort:
+        distance = get_manhattan_dist_external(
+            data_file, run_size=run_size, tmp_dir=tmp_dir, is_sorted=is_sorted
+        )
+        print(f"Manhattan distance: {distance}")
+        return
+    if chunked:
+        series1, series2 = load_data_chunked(data_file, chunk_size, memmap_dir)
+    else:
+        dataset = load_data(data_file)
+        series1 = dataset.iloc[:, 0]
+        series2 = dataset.iloc[:, 1]
+    if is_sorted:
+        distance = get_manhattan_dist(series1, series2)
+    elif sort_method == SortMethod.counting or (
+        sort_method == SortMethod.auto and is_dense_range(series1, series2)
+    ):
+        distance = get_manhattan_dist_counting(series1, series2)
+    else:
+        if chunked:
+            series1.sort()
+            series2.sort()
+        else:
+            series1 = series1.sort_values(ignore_index=True)
+            series2 = series2.sort_values(ignore_index=True)
+        distance = get_manhattan_dist(series1, series2)
     print(f"Manhattan distance: {distance}")
 
 
@@ -53,10 +139,72 @@ def run_part2(
     data_file: Annotated[
         str, typer.Argument(..., help="Path to a TSV file for a two-column integer matrix.")
     ],
+    chunked: ChunkedOption = False,
+    chunk_size: ChunkSizeOption = 1_000_000,
+    memmap_dir: MemmapDirOption = None,
+    engine: Annotated[
+        SimilarityEngine,
+        typer.Option(
+            "--engine",
+            help="Similarity score implementation. 'counter' is the pure Python reference.",
+        ),
+    ] = SimilarityEngine.numpy,
 ):
     """Calculate similarity score between two integer series from a TSV file."""
-    dataset = load_data(data_file)
-    series1 = dataset.iloc[:, 0].copy(deep=True)
-    series2 = dataset.iloc[:, 1].copy(deep=True)
-    score = get_similarity_score(series1, series2)
+    if chunked:
+        series1, series2 = load_data_chunked(data_file, chunk_size, memmap_dir)
+    else:
+        dataset = load_data(data_file)
+        series1 = dataset.iloc[:, 0]
+        series2 = dataset.iloc[:, 1]
+    if engine == SimilarityEngine.counter:
+        score = get_similarity_score(series1, series2)
+    else:
+        score = get_similarity_score_vectorized(series1, series2)
     print(f"Similarity score: {score}")
+
+
+@app.command()
+def run_stream(
+    data_file: Annotated[
+        str,
+        typer.Argument(
+            ..., help="Path to a TSV file of location-ID pairs, or '-' to read from stdin."
+        ),
+    ],
+    min_id: Annotated[int, typer.Option("--min-id", help="Smallest location ID accepted.")] = 0,
+    max_id: Annotated[int, typer.Option("--max-id", help="Largest location ID accepted.")] = 99999,
+    report_every: Annotated[
+        int,
+        typer.Option(
+            "--report-every", help="Print both metrics after every N pairs. Disabled if 0."
+        ),
+    ] = 0,
+):
+    """Incrementally update Manhattan distance and similarity score as pairs arrive."""
+    tracker = IncrementalPairTracker(value_range=(min_id, max_id))
+    try:
+        # Standard input is not ours to close, so it gets a no-op context manager
+        fh = contextlib.nullcontext(sys.stdin) if data_file == "-" else open(data_file, "r")
+    except FileNotFoundError:
+        print(f"Error: The file '{data_file}' was not found.")
+        raise typer.Exit(code=1)
+    with fh as lines:
+        for line in lines:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                value1, value2 = (int(x) for x in line.split("\t"))
+                tracker.add(value1, value2)
+            except ValueError as e:
+                print(f"Error: Invalid pair '{line}': {e}")
+                raise typer.Exit(code=1)
+            if report_every > 0 and tracker.size % report_every == 0:
+                print(
+                    f"Pairs: {tracker.size}\tManhattan distance: {tracker.distance}"
+                    f"\tSimilarity score: {tracker.score}",
+                    flush=True,
+                )
+    print(f"Manhattan distance: {tracker.distance}")
+    print(f"Similarity score: {tracker.score}")
@@ -1,16 +1,127 @@
 from collections import Counter
+from collections.abc import Iterator
 import numpy
+import os
 import pandas
+import tempfile
+import typer
+from numpy.typing import NDArray
+
+# Number of elements per block when reducing over large arrays
+DIST_BLOCK_SIZE = 1 << 20
+# Largest value range (max - min + 1) histogrammed by the counting sort path
+MAX_COUNTING_RANGE = 1 << 24
+
+
+def _count_lines(file_path: str, block_size: int = 1 << 24) -> int:
+    """Count newline-terminated lines in a file without decoding it.
+
+    A final line without a trailing newline is also counted.
+
+    Args:
+      file_path (str): Path to the file.
+      block_size (int): Number of bytes read per block.
+
+    Returns:
+      int: Upper bound on the number of data rows in the file.
+    """
+    count = 0
+    last = b"\n"
+    with open(file_path, "rb") as fh:
+        while block := fh.read(block_size):
+            count += block.count(b"\n")
+            last = block[-1:]
+    if last != b"\n":
+        count += 1
+    return count
+
+
+def _allocate_column(size: int, memmap_dir: str | None) -> NDArray[numpy.int64]:
+    """Allocate an int64 column buffer in memory or as an anonymous memory-mapped file.
+
+    Args:
+      size (int): Number of elements in the buffer.
+      memmap_dir (str | None): Directory for the backing file. Allocates in memory if None.
+
+    Returns:
+      NDArray[numpy.int64]: Uninitialized buffer of length `size`.
+    """
+    if memmap_dir is None:
+        return numpy.empty(size, dtype=numpy.int64)
+    if size == 0:
+        return numpy.empty(0, dtype=numpy.int64)
+    # Backing file is unlinked on close and freed once the mapping is released
+    with tempfile.TemporaryFile(dir=memmap_dir) as fh:
+        return numpy.memmap(fh, dtype=numpy.int64, mode="w+", shape=(size,))
+
+
+def _iter_pair_chunks(
+    file_path: str, chunk_size: int
+) -> Iterator[tuple[NDArray[numpy.int64], NDArray[numpy.int64]]]:
+    """Parse a two-column TSV file into blocks of int64 column arrays.
+
+    Args:
+      file_path (str): Path to the TSV file.
+      chunk_size (int): Number of rows parsed per block.
+
+    Yields:
+      tuple: Arrays holding the first and second columns of the next block of rows.
+    """
+    reader = pandas.read_table(
+        file_path, sep="\t", header=None, dtype=numpy.int64, chunksize=chunk_size
+    )
+    with reader:
+        for chunk in reader:
+            if chunk.shape[1] != 2:
+                print("Error: Data file must contain exactly two columns.")
+                raise typer.Exit(code=1)
+            block = chunk.to_numpy()
+            yield block[:, 0], block[:, 1]
+
+
+def load_data_chunked(
+    file_path: str, chunk_size: int = 1_000_000, memmap_dir: str | None = None
+) -> tuple[NDArray[numpy.int64], NDArray[numpy.int64]]:
+    """Load a two-column TSV file block by block into two preallocated int64 arrays.
+
+    Rows are parsed `chunk_size` at a time and copied directly into the output buffers, so peak
+    memory stays close to the size of the two integer columns.
+
+    Args:
+      file_path (str): Path to the TSV file.
+      chunk_size (int): Number of rows parsed per block.
+      memmap_dir (str | None): If set, back the arrays with memory-mapped files in this directory.
+
+    Returns:
+      tuple: Arrays holding the first and second columns of the TSV file.
+    """
+    if file_path is None or not isinstance(file_path, str) or file_path.strip() == "":
+        print("Error: A valid file path must be provided.")
+        raise typer.Exit(code=1)
+    if chunk_size <= 0:
+        raise ValueError("Chunk size must be positive.")
+    capacity = _count_lines(file_path)
+    array1 = _allocate_column(capacity, memmap_dir)
+    array2 = _allocate_column(capacity, memmap_dir)
+    n_rows = 0
+    for column1, column2 in _iter_pair_chunks(file_path, chunk_size):
+        array1[n_rows : n_rows + column1.size] = column1
+        array2[n_rows : n_rows + column2.size] = column2
+        n_rows += column1.size
+    # Blank lines are skipped by the parser so the buffers may be over-allocated
+    return array1[:n_rows], array2[:n_rows]
 
 
 def get_manhattan_dist(
-    series1: pandas.core.series.Series, series2: pandas.core.series.Series
+    series1: pandas.core.series.Series | NDArray[numpy.int_],
+    series2: pandas.core.series.Series | NDArray[numpy.int_],
 ) -> int:
     """Calculate Manhattan distance given two lists of integers.
 
     Args:
-      series1 (pandas.core.series.Series): Series of integers.
-      series2 (pandas.core.series.Series): Series of integers of same length as `series1`.
+      series1 (pandas.core.series.Series | NDArray): Series of integers.
+      series2 (pandas.core.series.Series | NDArray): Series of integers of same length as
+        `series1`.
 
     Returns:
       int: The Manhattan distance between the two numeric series.
@@ -21,11 +132,91 @@ def get_manhattan_dist(
         raise ValueError("Input series1 must be of integer dtype.")
     if pandas.api.types.is_integer_dtype(series2) is False:
         raise ValueError("Input series2 must be of integer dtype.")
-    return numpy.absolute(series1.to_numpy() - series2.to_numpy()).sum()
+    array1 = numpy.asarray(series1)
+    array2 = numpy.asarray(series2)
+    # Reduce in blocks to bound the size of temporary arrays
+    distance = 0
+    for start in range(0, array1.size, DIST_BLOCK_SIZE):
+        stop = start + DIST_BLOCK_SIZE
+        distance += int(numpy.absolute(array1[start:stop] - array2[start:stop]).sum())
+    return distance
+
+
+def is_dense_range(
+    series1: pandas.core.series.Series | NDArray[numpy.int_],
+    series2: pandas.core.series.Series | NDArray[numpy.int_],
+    max_range: int = MAX_COUNTING_RANGE,
+) -> bool:
+    """Check whether two integer series span a value range small enough for a counting sort.
+
+    The range is considered dense when it is at most `max_range` and no larger than the combined
+    number of elements, so histogramming it costs no more than a pass over the data.
+
+    Args:
+      series1 (pandas.core.series.Series | NDArray): Series of integers.
+      series2 (pandas.core.series.Series | NDArray): Series of integers.
+      max_range (int): Largest value range allowed.
+
+    Returns:
+      bool: True if the value range of both series is dense.
+    """
+    if series1.size == 0 or series2.size == 0:
+        return False
+    low = min(series1.min(), series2.min())
+    high = max(series1.max(), series2.max())
+    value_range = int(high) - int(low) + 1
+    return value_range <= max_range and value_range <= series1.size + series2.size
+
+
+def get_manhattan_dist_counting(
+    series1: pandas.core.series.Series | NDArray[numpy.int_],
+    series2: pandas.core.series.Series | NDArray[numpy.int_],
+    value_range: tuple[int, int] | None = None,
+) -> int:
+    """Calculate Manhattan distance between the sorted forms of two unsorted integer series.
+
+    Instead of sorting, both series are histogrammed over their shared value range. The distance
+    between the sorted series equals the sum over each value `v` of the absolute difference between
+    the number of elements no greater than `v` in each series, which takes O(n + range) time.
+
+    Args:
+      series1 (pandas.core.series.Series | NDArray): Series of integers in any order.
+      series2 (pandas.core.series.Series | NDArray): Series of integers of same length as
+        `series1` in any order.
+      value_range (tuple[int, int] | None): Inclusive (min, max) bounds on the values. Detected
+        from the data if None.
+
+    Returns:
+      int: The Manhattan distance between the two series after sorting.
+    """
+    if series1.size != series2.size:
+        raise ValueError("Input series must be of the same length.")
+    if pandas.api.types.is_integer_dtype(series1) is False:
+        raise ValueError("Input series1 must be of integer dtype.")
+    if pandas.api.types.is_integer_dtype(series2) is False:
+        raise ValueError("Input series2 must be of integer dtype.")
+    if series1.size == 0:
+        return 0
+    array1 = numpy.asarray(series1)
+    array2 = numpy.asarray(series2)
+    if value_range is None:
+        low = int(min(array1.min(), array2.min()))
+        high = int(max(array1.max(), array2.max()))
+    else:
+        low, high = value_range
+        if min(array1.min(), array2.min()) < low or max(array1.max(), array2.max()) > high:
+            raise ValueError("Input series contain values outside the given value range.")
+    if high - low + 1 > MAX_COUNTING_RANGE:
+        raise ValueError(f"Value range exceeds maximum of {MAX_COUNTING_RANGE}.")
+    size = high - low + 1
+    cumulative1 = numpy.bincount(array1 - low, minlength=size).cumsum()
+    cumulative2 = numpy.bincount(array2 - low, minlength=size).cumsum()
+    return int(numpy.absolute(cumulative1 - cumulative2).sum())
 
 
 def get_similarity_score(
-    series1: pandas.core.series.Series, series2: pandas.core.series.Series
+    series1: pandas.core.series.Series | NDArray[numpy.int_],
+    series2: pandas.core.series.Series | NDArray[numpy.int_],
 ) -> int:
     """Calculate similarity score between two lists of integers.
 
@@ -49,3 +240,256 @@ def get_similarity_score(
     weights = Counter(series2)
     score = sum(item * weights.get(item, 0) for item in series1)
     return score
+
+
+def get_similarity_score_vectorized(
+    series1: pandas.core.series.Series | NDArray[numpy.int_],
+    series2: pandas.core.series.Series | NDArray[numpy.int_],
+) -> int:
+    """Calculate similarity score between two lists of integers using NumPy array operations.
+
+    Produces the same result as `get_similarity_score` but replaces the Python-level loop with a
+    join between the distinct values of both series via a sorted lookup.
+
+    Args:
+      series1 (pandas.core.series.Series | NDArray): Series of integers.
+      series2 (pandas.core.series.Series | NDArray): Series of integers of same length as
+        `series1`.
+
+    Returns:
+      int: Similarity score between the two numeric series.
+    """
+    if series1.size != series2.size:
+        raise ValueError("Input series must be of the same length.")
+    if pandas.api.types.is_integer_dtype(series1) is False:
+        raise ValueError("Input series1 must be of integer dtype.")
+    if pandas.api.types.is_integer_dtype(series2) is False:
+        raise ValueError("Input series2 must be of integer dtype.")
+    if series1.size == 0:
+        return 0
+    values1, counts1 = numpy.unique(numpy.asarray(series1), return_counts=True)
+    values2, counts2 = numpy.unique(numpy.asarray(series2), return_counts=True)
+    positions = numpy.searchsorted(values2, values1).clip(max=values2.size - 1)
+    is_match = values2[positions] == values1
+    weights = counts2[positions[is_match]]
+    # Products of repeated large IDs overflow int64, so only the matches use Python integers
+    return sum(
+        int(value) * int(count) * int(weight)
+        for value, count, weight in zip(values1[is_match], counts1[is_match], weights)
+    )
+
+
+def _merge_sorted_runs(run_paths: list[str], block_size: int) -> Iterator[NDArray[numpy.int64]]:
+    """Merge sorted binary int64 run files into a single sorted stream of blocks.
+
+    Each run is read `block_size` elements at a time. Buffered values no greater than the smallest
+    last-buffered value among runs with unread data are safe to emit, so every step releases at
+    least one full block while holding at most one block per run in memory.
+
+    Args:
+      run_paths (list[str]): Paths to raw int64 files, each sorted in ascending order.
+      block_size (int): Number of elements read from a run at a time.
+
+    Yields:
+      NDArray[numpy.int64]: Consecutive sorted blocks of the merged stream.
+    """
+    itemsize = numpy.dtype(numpy.int64).itemsize
+    remaining = [os.path.getsize(path) // itemsize for path in run_paths]
+    offsets = [0] * len(run_paths)
+    buffers = [numpy.empty(0, dtype=numpy.int64) for _ in run_paths]
+
+    def refill(i: int) -> None:
+        count = min(block_size, remaining[i])
+        buffers[i] = numpy.fromfile(
+            run_paths[i], dtype=numpy.int64, count=count, offset=offsets[i] * itemsize
+        )
+        offsets[i] += count
+        remaining[i] -= count
+
+    for i in range(len(run_paths)):
+        refill(i)
+    while any(buffer.size for buffer in buffers):
+        pending = [
+            buffers[i][-1] for i in range(len(run_paths)) if remaining[i] and buffers[i].size
+        ]
+        bound = min(pending) if pending else None
+        emitted = []
+        for i, buffer in enumerate(buffers):
+            cut = buffer.size if bound is None else numpy.searchsorted(buffer, bound, "right")
+            emitted.append(buffer[:cut])
+            buffers[i] = buffer[cut:]
+            if buffers[i].size == 0 and remaining[i]:
+                refill(i)
+        block = numpy.concatenate(emitted)
+        block.sort()
+        yield block
+
+
+def get_manhattan_dist_external(
+    file_path: str,
+    run_size: int = 10_000_000,
+    block_size: int = 1 << 16,
+    tmp_dir: str | None = None,
+    is_sorted: bool = False,
+) -> int:
+    """Calculate Manhattan distance between the two columns of a TSV file using an external sort.
+
+    The file is parsed `run_size` rows at a time. Each column of a block is sorted in memory and
+    spilled to a temporary binary run file. The runs of both columns are then k-way merged in
+    lockstep so `|a - b|` can be accumulated without materializing either column in full.
+
+    Args:
+      file_path (str): Path to a two-column TSV file of integers.
+      run_size (int): Number of rows sorted in memory per spilled run.
+      block_size (int): Number of elements read from each run file at a time during the merge.
+      tmp_dir (str | None): Directory for the temporary run files. Uses the system default if None.
+      is_sorted (bool): If True, both columns are already sorted and are streamed without
+        spilling.
+
+    Returns:
+      int: The Manhattan distance between the two sorted columns.
+    """
+    if file_path is None or not isinstance(file_path, str) or file_path.strip() == "":
+        print("Error: A valid file path must be provided.")
+        raise typer.Exit(code=1)
+    if run_size <= 0 or block_size <= 0:
+        raise ValueError("Run size and block size must be positive.")
+    if is_sorted:
+        return sum(
+            get_manhattan_dist(column1, column2)
+            for column1, column2 in _iter_pair_chunks(file_path, run_size)
+        )
+    with tempfile.TemporaryDirectory(dir=tmp_dir) as run_dir:
+        run_paths1 = []
+        run_paths2 = []
+        for i, (column1, column2) in enumerate(_iter_pair_chunks(file_path, run_size)):
+            for column, run_paths, name in [(column1, run_paths1, "a"), (column2, run_paths2, "b")]:
+                run_path = os.path.join(run_dir, f"{name}_{i}.bin")
+                numpy.sort(column).tofile(run_path)
+                run_paths.append(run_path)
+        stream1 = _merge_sorted_runs(run_paths1, block_size)
+        stream2 = _merge_sorted_runs(run_paths2, block_size)
+        distance = 0
+        carry1 = numpy.empty(0, dtype=numpy.int64)
+        carry2 = numpy.empty(0, dtype=numpy.int64)
+        while True:
+            if carry1.size == 0:
+                carry1 = next(stream1, carry1)
+            if carry2.size == 0:
+                carry2 = next(stream2, carry2)
+            if carry1.size == 0 or carry2.size == 0:
+                break
+            n = min(carry1.size, carry2.size)
+            distance += int(numpy.absolute(carry1[:n] - carry2[:n]).sum())
+            carry1 = carry1[n:]
+            carry2 = carry2[n:]
+    return distance
+
+
+class IncrementalPairTracker:
+    """Running Manhattan distance and similarity score over a growing set of location-ID pairs.
+
+    The Manhattan distance between the sorted columns equals the sum over each value `v` of
+    `|d(v)|`, where `d(v)` is the number of first-column IDs no greater than `v` minus the number
+    of second-column IDs no greater than `v`. Adding the pair `(a, b)` shifts `d` by one on the
+    values between `a` and `b` only, so the distance is patched with a single vectorized pass over
+    that span. The similarity score is patched in O(1) from per-value frequency tables.
+
+    Attributes:
+      low (int): Smallest location ID accepted.
+      high (int): Largest location ID accepted.
+      size (int): Number of pairs currently tracked.
+    """
+
+    def __init__(self, value_range: tuple[int, int] = (0, 99999)) -> None:
+        low, high = value_range
+        if high < low:
+            raise ValueError("Invalid value range provided.")
+        if high - low + 1 > MAX_COUNTING_RANGE:
+            raise ValueError(f"Value range exceeds maximum of {MAX_COUNTING_RANGE}.")
+        self.low: int = low
+        self.high: int = high
+        self.size: int = 0
+        self._counts1: NDArray[numpy.int64] = numpy.zeros(high - low + 1, dtype=numpy.int64)
+        self._counts2: NDArray[numpy.int64] = numpy.zeros(high - low + 1, dtype=numpy.int64)
+        self._cumulative_diff: NDArray[numpy.int64] = numpy.zeros(high - low, dtype=numpy.int64)
+        self._distance: int = 0
+        self._score: int = 0
+
+    @property
+    def distance(self) -> int:
+        return self._distance
+
+    @property
+    def score(self) -> int:
+        return self._score
+
+    def _check_value(self, value: int) -> int:
+        if not self.low <= value <= self.high:
+            raise ValueError(f"Value {value} is outside the range [{self.low}, {self.high}].")
+        return value - self.low
+
+    def _shift(self, index1: int, index2: int, step: int) -> None:
+        """Add `step` to `d` on the span between two offsets and patch the distance."""
+        if index1 < index2:
+            span = self._cumulative_diff[index1:index2]
+        else:
+            span = self._cumulative_diff[index2:index1]
+            step = -step
+        if span.size == 0:
+            return
+        # Each |d(v)| moves away from zero by one unless d(v) starts on the opposite side of zero
+        towards_zero = int((span < 0).sum()) if step > 0 else int((span > 0).sum())
+        self._distance += span.size - 2 * towards_zero
+        span += step
+
+    def add(self, value1: int, value2: int) -> None:
+        """Add a location-ID pair.
+
+        Args:
+          value1 (int): ID appended to the first list.
+          value2 (int): ID appended to the second list.
+        """
+        index1 = self._check_value(value1)
+        index2 = self._check_value(value2)
+        self._score += value1 * int(self._counts2[index1])
+        self._counts1[index1] += 1
+        self._score += value2 * int(self._counts1[index2])
+        self._counts2[index2] += 1
+        self._shift(index1, index2, 1)
+        self.size += 1
+
+    def remove(self, value1: int, value2: int) -> None:
+        """Remove one occurrence of each ID from its list.
+
+        Args:
+          value1 (int): ID removed from the first list.
+          value2 (int): ID removed from the second list.
+        """
+        index1 = self._check_value(value1)
+        index2 = self._check_value(value2)
+        if self._counts1[index1] == 0 or self._counts2[index2] == 0:
+            raise ValueError(f"Pair ({value1}, {value2}) is not tracked.")
+        self._counts2[index2] -= 1
+        self._score -= value2 * int(self._counts1[index2])
+        self._counts1[index1] -= 1
+        self._score -= value1 * int(self._counts2[index1])
+        self._shift(index1, index2, -1)
+        self.size -= 1
+
+    def extend(
+        self,
+        series1: pandas.core.series.Series | NDArray[numpy.int_],
+        series2: pandas.core.series.Series | NDArray[numpy.int_],
+    ) -> None:
+        """Add a batch of location-ID pairs.
+
+        Args:
+          series1 (pandas.core.series.Series | NDArray): IDs appended to the first list.
+          series2 (pandas.core.series.Series | NDArray): IDs appended to the second list, of same
+            length as `series1`.
+        """
+        if series1.size != series2.size:
+            raise ValueError("Input series must be of the same length.")
+        for value1, value2 in zip(numpy.asarray(series1).tolist(), numpy.asarray(series2).tolist()):
+            self.add(value1, value2)
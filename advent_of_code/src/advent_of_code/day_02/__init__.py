@@ -1,15 +1,43 @@
 from .utils import (
+    ReportCheck,
+    Reports,
+    count_safe_reports_parallel,
+    evaluate_report,
     get_diff,
+    get_min_removal_counts,
+    get_min_removals,
+    get_safe_mask,
     load_data,
+    load_reports,
     get_series_combinations,
+    is_safe_brute_force,
+    is_safe_report,
+    is_safe_with_dampener,
+    is_safe_with_removals,
+    iter_reports,
+    iter_series_combinations,
     get_change_violation_count,
     get_monotonicity_violation_count,
 )
 
 __all__ = [
+    "ReportCheck",
+    "Reports",
+    "count_safe_reports_parallel",
+    "evaluate_report",
     "get_diff",
+    "get_min_removal_counts",
+    "get_min_removals",
+    "get_safe_mask",
     "load_data",
+    "load_reports",
     "get_series_combinations",
+    "is_safe_brute_force",
+    "is_safe_report",
+    "is_safe_with_dampener",
+    "is_safe_with_removals",
+    "iter_reports",
+    "iter_series_combinations",
     "get_monotonicity_violation_count",
     "get_change_violation_count",
 ]
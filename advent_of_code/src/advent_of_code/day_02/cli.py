@@ -1,38 +1,131 @@
-import pandas
+import functools
 import typer
+from enum import Enum
 from typing_extensions import Annotated
 from .utils import (
-    get_diff,
-    load_data,
-    get_series_combinations,
-    get_change_violation_count,
-    get_monotonicity_violation_count,
+    count_safe_reports_parallel,
+    get_min_removal_counts,
+    get_safe_mask,
+    load_reports,
+    is_safe_brute_force,
+    is_safe_report,
+    is_safe_with_dampener,
+    is_safe_with_removals,
+    iter_reports,
 )
 
 
 app = typer.Typer(help="Day 2: Red-Nosed Reports")
 
 
+class ToleranceEngine(str, Enum):
+    dampener = "dampener"
+    brute_force = "brute-force"
+    dp = "dp"
+
+
+WorkersOption = Annotated[
+    int,
+    typer.Option(
+        "--workers", help="Number of worker processes. Reports are checked serially if 1."
+    ),
+]
+
+
+StreamOption = Annotated[
+    bool,
+    typer.Option(
+        "--stream",
+        help="Parse and check one line at a time, keeping only running counts in memory.",
+        is_flag=True,
+    ),
+]
+ProgressEveryOption = Annotated[
+    int,
+    typer.Option(
+        "--progress-every",
+        help="In stream mode, print partial counts after every N reports. Disabled if 0.",
+    ),
+]
+
+
+def run_streaming(data_file: str, is_safe, progress_every: int) -> int:
+    """Count safe reports while reading the file line by line.
+
+    Args:
+        data_file (str): Path to a TSV file with rows of integers.
+        is_safe (Callable): Report check.
+        progress_every (int): Print partial counts after every N reports. Disabled if 0.
+
+    Returns:
+        int: Number of safe reports.
+    """
+    safe_count = 0
+    for report_count, levels in enumerate(iter_reports(data_file), start=1):
+        if len(levels) <= 1:
+            print("Warning: Skipping row. Report has less than 2 levels.")
+        elif is_safe(levels, min_change=1, max_change=3):
+            safe_count += 1
+        if progress_every > 0 and report_count % progress_every == 0:
+            print(f"Reports processed: {report_count}\tSafe reports: {safe_count}", flush=True)
+    return safe_count
+
+
+def run_parallel(data_file: str, is_safe, workers: int) -> int:
+    """Count safe reports across worker processes and report skipped rows.
+
+    Args:
+        data_file (str): Path to a TSV file with rows of integers.
+        is_safe (Callable): Module-level report check.
+        workers (int): Number of worker processes.
+
+    Returns:
+        int: Number of safe reports.
+    """
+    if data_file is None or not isinstance(data_file, str) or data_file.strip() == "":
+        print("Error: A valid file path must be provided.")
+        raise typer.Exit(code=1)
+    try:
+        safe_count, short_count = count_safe_reports_parallel(
+            data_file, is_safe, workers, min_change=1, max_change=3
+        )
+    except ValueError as e:
+        print(f"Error: {e}")
+        raise typer.Exit(code=1)
+    for _ in range(short_count):
+        print("Warning: Skipping row. Report has less than 2 levels.")
+    return safe_count
+
+
 @app.command()
 def run_part1(
     data_file: Annotated[
         str, typer.Argument(..., help="Path to a TSV file with rows of integers.")
     ],
+    workers: WorkersOption = 1,
+    stream: StreamOption = False,
+    progress_every: ProgressEveryOption = 0,
 ):
     """Check if reports are monotonic and within change thresholds.
 
     This check only considers reports with no violations. The logic will break on reports with >0 violations.
     """
-    dataset = load_data(data_file)
-    safe_count = 0
-    for row_series in dataset:
-        if row_series.size <= 1:
-            print("Warning: Skipping row. Report has less than 2 levels.")
-            continue
-        monotonicity_violations = get_monotonicity_violation_count(row_series)
-        change_violations = get_change_violation_count(row_series, min_change=1, max_change=3)
-        if monotonicity_violations == 0 and change_violations == 0:
-            safe_count += 1
+    if stream and workers > 1:
+        print("Error: Streaming is only supported with 1 worker.")
+        raise typer.Exit(code=1)
+    if stream:
+        safe_count = run_streaming(data_file, is_safe_report, progress_every)
+        print(f"Number of safe reports: {safe_count}")
+        return
+    if workers > 1:
+        safe_count = run_parallel(data_file, is_safe_report, workers)
+        print(f"Number of safe reports: {safe_count}")
+        return
+    reports = load_reports(data_file)
+    is_short = reports.lengths <= 1
+    for _ in range(int(is_short.sum())):
+        print("Warning: Skipping row. Report has less than 2 levels.")
+    safe_count = int(get_safe_mask(reports, min_change=1, max_change=3).sum())
     print(f"Number of safe reports: {safe_count}")
 
 
@@ -41,31 +134,84 @@ def run_part2(
     data_file: Annotated[
         str, typer.Argument(..., help="Path to a TSV file with rows of integers.")
     ],
+    engine: Annotated[
+        ToleranceEngine,
+        typer.Option(
+            "--engine",
+            help=(
+                "Removal check. 'brute-force' tries every single-level removal as a reference. "
+                "'dp' supports any tolerance."
+            ),
+        ),
+    ] = ToleranceEngine.dampener,
+    tolerance: Annotated[
+        int,
+        typer.Option(
+            "--tolerance",
+            help="Number of levels that may be removed. Values other than 1 use 'dp'.",
+        ),
+    ] = 1,
+    workers: WorkersOption = 1,
+    stream: StreamOption = False,
+    progress_every: ProgressEveryOption = 0,
 ):
     """Check if reports are monotonic and within change thresholds assuming a 1 element tolerance.
 
-    This check uses a brute force combinatorial approach to check if removing one element can make
-    the report safe. This can become computationally expensive for reports with many levels.
+    By default, only the levels around the first violation are tried for removal, which takes
+    linear time per report.
     """
-    dataset = load_data(data_file)
+    if tolerance < 0:
+        print("Error: Tolerance must be non-negative.")
+        raise typer.Exit(code=1)
+    if engine == ToleranceEngine.dp or tolerance != 1:
+        is_safe = functools.partial(is_safe_with_removals, tolerance=tolerance)
+    elif engine == ToleranceEngine.dampener:
+        is_safe = is_safe_with_dampener
+    else:
+        is_safe = is_safe_brute_force
+    if stream and workers > 1:
+        print("Error: Streaming is only supported with 1 worker.")
+        raise typer.Exit(code=1)
+    if stream:
+        global_safe_count = run_streaming(data_file, is_safe, progress_every)
+        print(f"Number of safe reports: {global_safe_count}")
+        return
+    if workers > 1:
+        global_safe_count = run_parallel(data_file, is_safe, workers)
+        print(f"Number of safe reports: {global_safe_count}")
+        return
+    reports = load_reports(data_file)
     global_safe_count = 0
-    for row_series in dataset:
+    for row_series in reports:
         if row_series.size <= 1:
             print("Warning: Skipping row. Report has less than 2 levels.")
             continue
-        monotonicity_violations = get_monotonicity_violation_count(row_series)
-        change_violations = get_change_violation_count(row_series, min_change=1, max_change=3)
-        if monotonicity_violations == 0 and change_violations == 0:
+        if is_safe(row_series, min_change=1, max_change=3):
             global_safe_count += 1
-            continue  # no need to check combinations
-        for _, row_combo in get_series_combinations(row_series, r=row_series.size - 1).iterrows():
-            combo_monotonicity_violations = get_monotonicity_violation_count(
-                pandas.Series(row_combo)
-            )
-            combo_change_violations = get_change_violation_count(
-                pandas.Series(row_combo), min_change=1, max_change=3
-            )
-            if combo_monotonicity_violations == 0 and combo_change_violations == 0:
-                global_safe_count += 1
-                break  # no need to check for more safe combos
     print(f"Number of safe reports: {global_safe_count}")
+
+
+@app.command()
+def run_tolerance_profile(
+    data_file: Annotated[
+        str, typer.Argument(..., help="Path to a TSV file with rows of integers.")
+    ],
+    max_removals: Annotated[
+        int, typer.Option("--max-removals", help="Largest tolerance to report.")
+    ] = 5,
+):
+    """Count safe reports for every tolerance from 0 up to a maximum number of removed levels."""
+    if max_removals < 0:
+        print("Error: Maximum number of removals must be non-negative.")
+        raise typer.Exit(code=1)
+    reports = load_reports(data_file)
+    is_short = reports.lengths <= 1
+    for _ in range(int(is_short.sum())):
+        print("Warning: Skipping row. Report has less than 2 levels.")
+    min_removals = get_min_removal_counts(
+        reports, min_change=1, max_change=3, max_removals=max_removals
+    )
+    min_removals = min_removals[~is_short]
+    for tolerance in range(max_removals + 1):
+        safe_count = int((min_removals <= tolerance).sum())
+        print(f"Tolerance {tolerance}: {safe_count} safe reports")
@@ -1,6 +1,93 @@
+from __future__ import annotations
+from array import array
+from collections.abc import Callable, Iterator, Sequence
+from concurrent.futures import ProcessPoolExecutor
 import itertools
+import numpy
+import os
 import pandas
 import typer
+from numpy.typing import NDArray
+from typing import NamedTuple
+
+
+class Reports:
+    """A compact ragged array of reports in compressed sparse row (CSR) layout.
+
+    All levels are stored back to back in one flat integer array. Report `i` spans
+    `values[offsets[i]:offsets[i + 1]]`, so indexing a report returns a NumPy view with no copy.
+
+    Attributes:
+        values (NDArray[numpy.int64]): Levels of all reports concatenated in file order.
+        offsets (NDArray[numpy.int64]): Start index of each report in `values`, followed by the
+            total number of levels.
+    """
+
+    def __init__(self, values: NDArray[numpy.int64], offsets: NDArray[numpy.int64]) -> None:
+        if offsets.ndim != 1 or offsets.size == 0 or offsets[0] != 0:
+            raise ValueError("Offsets must be a 1-D array starting at 0.")
+        if offsets[-1] != values.size or numpy.any(numpy.diff(offsets) < 0):
+            raise ValueError("Offsets must be non-decreasing and end at the number of values.")
+        self.values: NDArray[numpy.int64] = values
+        self.offsets: NDArray[numpy.int64] = offsets
+
+    def __len__(self) -> int:
+        return self.offsets.size - 1
+
+    def __getitem__(self, index: int) -> NDArray[numpy.int64]:
+        if index < 0:
+            index += len(self)
+        if index < 0 or index >= len(self):
+            raise IndexError("Report index out of range.")
+        return self.values[self.offsets[index] : self.offsets[index + 1]]
+
+    def __iter__(self) -> Iterator[NDArray[numpy.int64]]:
+        for start, stop in zip(self.offsets[:-1].tolist(), self.offsets[1:].tolist()):
+            yield self.values[start:stop]
+
+    @property
+    def lengths(self) -> NDArray[numpy.int64]:
+        """Number of levels in each report."""
+        return numpy.diff(self.offsets)
+
+    @property
+    def nbytes(self) -> int:
+        """Memory used by the underlying arrays in bytes."""
+        return self.values.nbytes + self.offsets.nbytes
+
+    @classmethod
+    def from_lists(cls, reports: list[list[int]]) -> Reports:
+        """Build a container from a list of reports.
+
+        Args:
+            reports (list[list[int]]): Levels of each report.
+
+        Returns:
+            Reports: The reports in CSR layout.
+        """
+        lengths = [len(report) for report in reports]
+        offsets = numpy.zeros(len(reports) + 1, dtype=numpy.int64)
+        numpy.cumsum(lengths, out=offsets[1:])
+        values = numpy.fromiter(itertools.chain.from_iterable(reports), dtype=numpy.int64)
+        return cls(values, offsets)
+
+
+class ReportCheck(NamedTuple):
+    """Violation tallies for a single report.
+
+    Attributes:
+        monotonicity_violations (int): Number of changes against the report's direction.
+        change_violations (int): Number of changes outside the change thresholds.
+        first_violation (int): Index of the level before the first violating change, or -1.
+    """
+
+    monotonicity_violations: int
+    change_violations: int
+    first_violation: int
+
+    @property
+    def is_safe(self) -> bool:
+        return self.first_violation < 0
 
 
 def load_data(file_path: str) -> list[pandas.core.series.Series]:
@@ -34,17 +121,93 @@ def load_data(file_path: str) -> list[pandas.core.series.Series]:
     return data
 
 
-def get_diff(series: pandas.Series, absolute: bool = False) -> pandas.Series:
+def load_reports(file_path: str) -> Reports:
+    """Load a TSV file with one report per row into a `Reports` container.
+
+    Lines are parsed one at a time into growable machine-integer buffers, so no per-report Python
+    objects outlive the line they came from.
+
+    Args:
+        file_path (str): Path to the TSV file.
+
+    Returns:
+        Reports: Reports from the TSV file in CSR layout.
+    """
+    if file_path is None or not isinstance(file_path, str) or file_path.strip() == "":
+        print("Error: A valid file path must be provided.")
+        raise typer.Exit(code=1)
+    values = array("q")
+    offsets = array("q", [0])
+    with open(file_path, "r") as fh:
+        for line in fh:
+            line = line.strip()
+            if not line:
+                print("Warning: Skipping empty line.")
+                continue
+            try:
+                values.extend([int(x) for x in line.split("\t")])
+            except (ValueError, OverflowError):
+                print(f"Error: Non-integer value found in line: {line}")
+                raise typer.Exit(code=1)
+            offsets.append(len(values))
+    if len(offsets) == 1:
+        print("Error: The provided file is empty.")
+        raise typer.Exit(code=1)
+    return Reports(
+        numpy.frombuffer(values, dtype=numpy.int64), numpy.frombuffer(offsets, dtype=numpy.int64)
+    )
+
+
+def iter_reports(file_path: str) -> Iterator[list[int]]:
+    """Stream reports from a TSV file one line at a time.
+
+    Each line is parsed only when the next report is requested, so memory use does not grow with
+    the file size.
+
+    Args:
+        file_path (str): Path to the TSV file.
+
+    Yields:
+        list[int]: Levels of the next report.
+    """
+    if file_path is None or not isinstance(file_path, str) or file_path.strip() == "":
+        print("Error: A valid file path must be provided.")
+        raise typer.Exit(code=1)
+    is_empty = True
+    with open(file_path, "r") as fh:
+        for line in fh:
+            line = line.strip()
+            if not line:
+                print("Warning: Skipping empty line.")
+                continue
+            try:
+                levels = [int(x) for x in line.split("\t")]
+            except ValueError:
+                print(f"Error: Non-integer value found in line: {line}")
+                raise typer.Exit(code=1)
+            is_empty = False
+            yield levels
+    if is_empty:
+        print("Error: The provided file is empty.")
+        raise typer.Exit(code=1)
+
+
+def get_diff(
+    series: pandas.Series | NDArray[numpy.int_], absolute: bool = False
+) -> pandas.Series | NDArray[numpy.int_]:
     """Calculate the difference between consecutive elements in a series.
 
     Args:
-        series (pandas.Series): Input series of integers.
+        series (pandas.Series | NDArray): Input series of integers.
         absolute (bool): If True, return absolute values of the differences.
     Returns:
-        pandas.Series: Series of differences.
+        pandas.Series | NDArray: Differences, as a NumPy array if the input is a NumPy array.
     """
+    if isinstance(series, numpy.ndarray):
+        series_diff = numpy.diff(series)
+        return numpy.absolute(series_diff) if absolute else series_diff
     if not isinstance(series, pandas.Series):
-        raise ValueError("Input must be a pandas Series.")
+        raise ValueError("Input must be a pandas Series or NumPy array.")
     if series.size <= 1:
         return pandas.Series(dtype=int)
     if absolute:
@@ -52,11 +215,80 @@ def get_diff(series: pandas.Series, absolute: bool = False) -> pandas.Series:
     return series.diff()[1:].astype(int).reset_index(drop=True)
 
 
-def get_series_combinations(series: pandas.Series, r: int) -> pandas.DataFrame:
+def _get_level_changes(
+    reports: Reports,
+) -> tuple[NDArray[numpy.int64], NDArray[numpy.int64], NDArray[numpy.int64]]:
+    """Calculate the changes between adjacent levels of all reports at once.
+
+    Args:
+        reports (Reports): Reports in CSR layout.
+
+    Returns:
+        tuple: Differences between each level and the next in the flat `values` array, and the
+            start and stop positions of each report's changes within it. Differences spanning two
+            reports fall outside every [start, stop) range.
+    """
+    changes = numpy.diff(reports.values, append=0)
+    starts = reports.offsets[:-1]
+    stops = numpy.maximum(reports.offsets[1:] - 1, starts)
+    return changes, starts, stops
+
+
+def _segment_sum(
+    flags: NDArray[numpy.bool_], starts: NDArray[numpy.int64], stops: NDArray[numpy.int64]
+) -> NDArray[numpy.int64]:
+    """Sum flags over [start, stop) segments using differences of a running total.
+
+    Unlike `numpy.add.reduceat`, this handles empty segments without special cases.
+
+    Args:
+        flags (NDArray[numpy.bool_]): Values to sum.
+        starts (NDArray[numpy.int64]): Start of each segment.
+        stops (NDArray[numpy.int64]): Stop of each segment.
+
+    Returns:
+        NDArray[numpy.int64]: Sum of each segment.
+    """
+    totals = numpy.zeros(flags.size + 1, dtype=numpy.int64)
+    numpy.cumsum(flags, out=totals[1:])
+    return totals[stops] - totals[starts]
+
+
+def get_safe_mask(
+    reports: Reports, min_change: int = 1, max_change: int = 3
+) -> NDArray[numpy.bool_]:
+    """Check all reports for monotonicity and change thresholds in a few array operations.
+
+    A report is safe if every change between adjacent levels lies within the thresholds and has
+    the same direction. Reports with less than 2 levels are never marked safe.
+
+    Args:
+        reports (Reports): Reports in CSR layout.
+        min_change (int): Minimum allowed absolute change.
+        max_change (int): Maximum allowed absolute change.
+
+    Returns:
+        NDArray[numpy.bool_]: Whether each report is safe.
+    """
+    if min_change < 0 or max_change < 0 or min_change > max_change:
+        raise ValueError("Invalid change thresholds provided.")
+    changes, starts, stops = _get_level_changes(reports)
+    increasing_violations = _segment_sum(
+        (changes < min_change) | (changes > max_change), starts, stops
+    )
+    decreasing_violations = _segment_sum(
+        (changes > -min_change) | (changes < -max_change), starts, stops
+    )
+    return (reports.lengths >= 2) & ((increasing_violations == 0) | (decreasing_violations == 0))
+
+
+def get_series_combinations(
+    series: pandas.Series | NDArray[numpy.int_], r: int
+) -> pandas.DataFrame:
     """Generate all unique combinations of elements in a series.
 
     Args:
-        series (pandas.Series): Input series of integers.
+        series (pandas.Series | NDArray): Input series of integers.
         r (int): Number of elements in each combination.
 
     Returns:
@@ -64,52 +296,442 @@ def get_series_combinations(series: pandas.Series, r: int) -> pandas.DataFrame:
     """
     if r <= 0 or r > len(series):
         raise ValueError("Invalid combination length.")
-    return pandas.DataFrame(list(itertools.combinations(series.values, r)))
+    return pandas.DataFrame(list(itertools.combinations(numpy.asarray(series), r)))
+
+
+def iter_series_combinations(
+    series: pandas.Series | NDArray[numpy.int_],
+    r: int,
+    predicate: Callable[[tuple[int, ...]], bool] | None = None,
+) -> Iterator[tuple[int, ...]]:
+    """Lazily generate unique combinations of elements in a series.
 
+    Combinations are produced one at a time in the same order as `get_series_combinations`, so a
+    caller that stops early never builds the remaining ones.
+
+    Args:
+        series (pandas.Series | NDArray): Input series of integers.
+        r (int): Number of elements in each combination.
+        predicate (Callable | None): If set, only combinations for which it returns True are
+            yielded.
 
-def get_monotonicity_violation_count(series: pandas.Series) -> int:
+    Yields:
+        tuple[int, ...]: The next combination.
+    """
+    if r <= 0 or r > len(series):
+        raise ValueError("Invalid combination length.")
+    combinations = itertools.combinations(numpy.asarray(series).tolist(), r)
+    if predicate is None:
+        yield from combinations
+    else:
+        yield from filter(predicate, combinations)
+
+
+def get_monotonicity_violation_count(
+    series: pandas.Series | NDArray[numpy.int_] | Reports,
+) -> int | NDArray[numpy.int64]:
     """Tally number of elements violating a monotonicity assumption.
 
     Args:
-        series (pandas.Series): Series of integers.
+        series (pandas.Series | NDArray | Reports): Series of integers, or a collection of reports.
 
     Returns:
-        int: Number of elements that violate monotonicity.
+        int | NDArray[numpy.int64]: Number of elements that violate monotonicity, per report if
+            `series` is a `Reports` container.
     """
-    series_diff = get_diff(series, absolute=False)
-    if series_diff.empty:
-        return 0
-
+    if isinstance(series, Reports):
+        changes, starts, stops = _get_level_changes(series)
+        if changes.size == 0:
+            return numpy.zeros(len(series), dtype=numpy.int64)
+        nonzero_totals = numpy.zeros(changes.size + 1, dtype=numpy.int64)
+        numpy.cumsum(changes != 0, out=nonzero_totals[1:])
+        # Position of the first non-zero change of each report establishes its direction
+        first_nonzero = numpy.searchsorted(nonzero_totals, nonzero_totals[starts] + 1) - 1
+        has_direction = first_nonzero < stops
+        is_increasing = changes[numpy.minimum(first_nonzero, changes.size - 1)] > 0
+        increases = _segment_sum(changes > 0, starts, stops)
+        decreases = _segment_sum(changes < 0, starts, stops)
+        return numpy.where(has_direction, numpy.where(is_increasing, decreases, increases), 0)
+    series_diff = numpy.asarray(get_diff(series, absolute=False))
     # Find first non-zero element to establish direction
-    for i in range(len(series_diff)):
-        if series_diff.iloc[i] != 0:
-            if series_diff.iloc[i] > 0:
-                return (series_diff < 0).sum()
-            else:
-                return (series_diff > 0).sum()
-    # All elements are zero
-    return 0
+    nonzero = numpy.flatnonzero(series_diff)
+    if nonzero.size == 0:
+        # Empty or all elements are zero
+        return 0
+    if series_diff[nonzero[0]] > 0:
+        return int((series_diff < 0).sum())
+    return int((series_diff > 0).sum())
 
 
 def get_change_violation_count(
-    series: pandas.Series, min_change: int = 1, max_change: int = 3
-) -> int:
+    series: pandas.Series | NDArray[numpy.int_] | Reports, min_change: int = 1, max_change: int = 3
+) -> int | NDArray[numpy.int64]:
     """Tally number of elements violating change rate thresholds.
 
     Args:
-        series (pandas.Series): Series of integers.
+        series (pandas.Series | NDArray | Reports): Series of integers, or a collection of reports.
         min_change (int): Minimum allowed absolute change.
         max_change (int): Maximum allowed absolute change.
 
     Returns:
-        int: Number of elements that violate change rate thresholds.
+        int | NDArray[numpy.int64]: Number of elements that violate change rate thresholds, per
+            report if `series` is a `Reports` container.
     """
     if min_change < 0 or max_change < 0 or min_change > max_change:
         raise ValueError("Invalid change thresholds provided.")
+    if isinstance(series, Reports):
+        changes, starts, stops = _get_level_changes(series)
+        changes = numpy.absolute(changes)
+        return _segment_sum((changes < min_change) | (changes > max_change), starts, stops)
     violations = 0
     series_diff = get_diff(series, absolute=True)
-    if series_diff.empty:
+    if series_diff.size == 0:
         return violations
     violations += (series_diff < min_change).sum()
     violations += (series_diff > max_change).sum()
-    return violations
+    return int(violations)
+
+
+def evaluate_report(
+    series: pandas.Series | NDArray[numpy.int_] | Sequence[int],
+    min_change: int = 1,
+    max_change: int = 3,
+) -> ReportCheck:
+    """Tally monotonicity and change threshold violations in a single pass over a report.
+
+    Gives the same counts as `get_monotonicity_violation_count` and `get_change_violation_count`
+    without building any intermediate diff series.
+
+    Args:
+        series (pandas.Series | NDArray | Sequence[int]): Series of integers.
+        min_change (int): Minimum allowed absolute change.
+        max_change (int): Maximum allowed absolute change.
+
+    Returns:
+        ReportCheck: Both violation counts and the position of the first violation.
+    """
+    if min_change < 0 or max_change < 0 or min_change > max_change:
+        raise ValueError("Invalid change thresholds provided.")
+    levels = series if isinstance(series, (list, tuple)) else numpy.asarray(series).tolist()
+    monotonicity_violations = 0
+    change_violations = 0
+    first_violation = -1
+    direction = 0
+    for i in range(len(levels) - 1):
+        change = levels[i + 1] - levels[i]
+        is_violation = False
+        # First non-zero change establishes direction
+        if direction == 0:
+            direction = (change > 0) - (change < 0)
+        elif change * direction < 0:
+            monotonicity_violations += 1
+            is_violation = True
+        if not min_change <= abs(change) <= max_change:
+            change_violations += 1
+            is_violation = True
+        if is_violation and first_violation < 0:
+            first_violation = i
+    return ReportCheck(monotonicity_violations, change_violations, first_violation)
+
+
+def is_safe_report(
+    series: pandas.Series | NDArray[numpy.int_] | Sequence[int],
+    min_change: int = 1,
+    max_change: int = 3,
+) -> bool:
+    """Check if a report is monotonic and within change thresholds with no tolerance.
+
+    Args:
+        series (pandas.Series | NDArray | Sequence[int]): Series of integers.
+        min_change (int): Minimum allowed absolute change.
+        max_change (int): Maximum allowed absolute change.
+
+    Returns:
+        bool: True if the report has no violations.
+    """
+    return evaluate_report(series, min_change, max_change).is_safe
+
+
+def _find_violation(
+    levels: list[int], direction: int, min_change: int, max_change: int, skip: int = -1
+) -> tuple[int, int] | None:
+    """Find the first adjacent pair of levels that breaks the change rules in a given direction.
+
+    Args:
+        levels (list[int]): Levels of a report.
+        direction (int): 1 for increasing or -1 for decreasing.
+        min_change (int): Minimum allowed absolute change.
+        max_change (int): Maximum allowed absolute change.
+        skip (int): Index of a level to treat as removed. No level is removed if negative.
+
+    Returns:
+        tuple[int, int] | None: Indices of the first violating pair, or None if there is none.
+    """
+    previous = -1
+    for i, level in enumerate(levels):
+        if i == skip:
+            continue
+        if previous >= 0:
+            change = (level - levels[previous]) * direction
+            if change < min_change or change > max_change:
+                return previous, i
+        previous = i
+    return None
+
+
+def is_safe_with_dampener(
+    series: pandas.Series | NDArray[numpy.int_] | Sequence[int],
+    min_change: int = 1,
+    max_change: int = 3,
+) -> bool:
+    """Check if a report is safe after removing at most one level in linear time.
+
+    For a fixed direction, safety only depends on adjacent levels. Any single removal that fixes a
+    report must therefore split the first violating pair, so only its two levels are candidates.
+    Both directions are tried, making at most six linear scans per report.
+
+    Args:
+        series (pandas.Series | NDArray | Sequence[int]): Series of integers.
+        min_change (int): Minimum allowed absolute change.
+        max_change (int): Maximum allowed absolute change.
+
+    Returns:
+        bool: True if the report is safe with a tolerance of one removed level.
+    """
+    if min_change < 0 or max_change < 0 or min_change > max_change:
+        raise ValueError("Invalid change thresholds provided.")
+    levels = series if isinstance(series, (list, tuple)) else numpy.asarray(series).tolist()
+    for direction in (1, -1):
+        violation = _find_violation(levels, direction, min_change, max_change)
+        if violation is None:
+            return True
+        for skip in violation:
+            if _find_violation(levels, direction, min_change, max_change, skip) is None:
+                return True
+    return False
+
+
+def get_min_removals(
+    series: pandas.Series | NDArray[numpy.int_] | Sequence[int],
+    min_change: int = 1,
+    max_change: int = 3,
+    max_removals: int | None = None,
+) -> int:
+    """Find the minimum number of levels to remove to make a report safe.
+
+    For each direction, `removals[i]` is the fewest removals among the first `i + 1` levels that
+    leave a safe report ending at level `i`. It extends the best earlier kept level `j` that can
+    step to level `i`, paying for the `i - j - 1` levels skipped in between. When `max_removals` is
+    set, only the `max_removals + 1` preceding levels can be `j`, which takes O(n * k) time instead
+    of O(n^2).
+
+    Args:
+        series (pandas.Series | NDArray | Sequence[int]): Series of integers.
+        min_change (int): Minimum allowed absolute change.
+        max_change (int): Maximum allowed absolute change.
+        max_removals (int | None): Largest number of removals of interest. Unbounded if None.
+
+    Returns:
+        int: The minimum number of removals. If it exceeds `max_removals`, `max_removals + 1` is
+            returned instead.
+    """
+    if min_change < 0 or max_change < 0 or min_change > max_change:
+        raise ValueError("Invalid change thresholds provided.")
+    if max_removals is not None and max_removals < 0:
+        raise ValueError("Maximum number of removals must be non-negative.")
+    levels = series if isinstance(series, (list, tuple)) else numpy.asarray(series).tolist()
+    n = len(levels)
+    if n == 0:
+        return 0
+    window = n if max_removals is None else max_removals + 1
+    best = n - 1  # keep only the first level
+    for direction in (1, -1):
+        removals = list(range(n))  # keep level i after removing all before it
+        for i in range(1, n):
+            for j in range(max(0, i - window), i):
+                change = (levels[i] - levels[j]) * direction
+                if min_change <= change <= max_change:
+                    removals[i] = min(removals[i], removals[j] + i - j - 1)
+            best = min(best, removals[i] + n - 1 - i)
+    if max_removals is not None:
+        return min(best, max_removals + 1)
+    return best
+
+
+def get_min_removal_counts(
+    reports: Reports, min_change: int = 1, max_change: int = 3, max_removals: int | None = None
+) -> NDArray[numpy.int64]:
+    """Find the minimum number of levels to remove to make each report safe.
+
+    Args:
+        reports (Reports): Reports in CSR layout.
+        min_change (int): Minimum allowed absolute change.
+        max_change (int): Maximum allowed absolute change.
+        max_removals (int | None): Largest number of removals of interest. Unbounded if None.
+
+    Returns:
+        NDArray[numpy.int64]: Minimum removals per report, capped at `max_removals + 1`.
+    """
+    return numpy.array(
+        [get_min_removals(report, min_change, max_change, max_removals) for report in reports],
+        dtype=numpy.int64,
+    )
+
+
+def is_safe_with_removals(
+    series: pandas.Series | NDArray[numpy.int_] | Sequence[int],
+    min_change: int = 1,
+    max_change: int = 3,
+    tolerance: int = 1,
+) -> bool:
+    """Check if a report is safe after removing at most `tolerance` levels.
+
+    Args:
+        series (pandas.Series | NDArray | Sequence[int]): Series of integers.
+        min_change (int): Minimum allowed absolute change.
+        max_change (int): Maximum allowed absolute change.
+        tolerance (int): Number of levels that may be removed.
+
+    Returns:
+        bool: True if the report is safe with the given tolerance.
+    """
+    return get_min_removals(series, min_change, max_change, max_removals=tolerance) <= tolerance
+
+
+def is_safe_brute_force(
+    series: pandas.Series | NDArray[numpy.int_] | Sequence[int],
+    min_change: int = 1,
+    max_change: int = 3,
+) -> bool:
+    """Check if a report is safe after removing at most one level by trying every removal.
+
+    This check uses a brute force combinatorial approach to check if removing one element can make
+    the report safe. This can become computationally expensive for reports with many levels.
+
+    Args:
+        series (pandas.Series | NDArray | Sequence[int]): Series of integers.
+        min_change (int): Minimum allowed absolute change.
+        max_change (int): Maximum allowed absolute change.
+
+    Returns:
+        bool: True if the report is safe with a tolerance of one removed level.
+    """
+
+    def is_safe(levels: tuple[int, ...]) -> bool:
+        return evaluate_report(levels, min_change, max_change).is_safe
+
+    if is_safe(tuple(numpy.asarray(series).tolist())):
+        return True  # no need to check combinations
+    # Stops at the first safe combination
+    safe_combos = iter_series_combinations(series, r=len(series) - 1, predicate=is_safe)
+    return next(safe_combos, None) is not None
+
+
+def _split_byte_ranges(file_path: str, n_ranges: int) -> list[tuple[int, int]]:
+    """Split a file into contiguous byte ranges that start and end on line boundaries.
+
+    Args:
+        file_path (str): Path to the file.
+        n_ranges (int): Target number of ranges. Fewer are returned for small files.
+
+    Returns:
+        list[tuple[int, int]]: Start and stop byte offsets of each range.
+    """
+    size = os.path.getsize(file_path)
+    boundaries = [0]
+    with open(file_path, "rb") as fh:
+        for i in range(1, n_ranges):
+            fh.seek(max(size * i // n_ranges, boundaries[-1]))
+            fh.readline()  # advance to the start of the next line
+            position = fh.tell()
+            if boundaries[-1] < position < size:
+                boundaries.append(position)
+    boundaries.append(size)
+    return list(zip(boundaries[:-1], boundaries[1:]))
+
+
+def _count_safe_in_range(
+    file_path: str,
+    start: int,
+    stop: int,
+    is_safe: Callable[..., bool],
+    min_change: int,
+    max_change: int,
+) -> tuple[int, int, int]:
+    """Parse and check the reports within a byte range of a TSV file.
+
+    Args:
+        file_path (str): Path to the TSV file.
+        start (int): Byte offset of the first line in the range.
+        stop (int): Byte offset just past the last line in the range.
+        is_safe (Callable): Module-level report check, such as `is_safe_report`.
+        min_change (int): Minimum allowed absolute change.
+        max_change (int): Maximum allowed absolute change.
+
+    Returns:
+        tuple[int, int, int]: Number of safe reports, number of reports with less than 2 levels
+            and number of reports parsed.
+    """
+    with open(file_path, "rb") as fh:
+        fh.seek(start)
+        data = fh.read(stop - start)
+    safe_count = 0
+    short_count = 0
+    report_count = 0
+    for line in data.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            levels = [int(x) for x in line.split(b"\t")]
+        except ValueError:
+            raise ValueError(f"Non-integer value found in line: {line.decode()}")
+        report_count += 1
+        if len(levels) <= 1:
+            short_count += 1
+        elif is_safe(levels, min_change, max_change):
+            safe_count += 1
+    return safe_count, short_count, report_count
+
+
+def count_safe_reports_parallel(
+    file_path: str,
+    is_safe: Callable[..., bool] = is_safe_report,
+    workers: int = 1,
+    min_change: int = 1,
+    max_change: int = 3,
+    chunks_per_worker: int = 4,
+) -> tuple[int, int]:
+    """Count safe reports in a TSV file using a pool of worker processes.
+
+    The file is split into line-aligned byte ranges and only the offsets are sent to the workers,
+    which read and parse their own range. This keeps pickling overhead to a few integers per task.
+
+    Args:
+        file_path (str): Path to the TSV file.
+        is_safe (Callable): Module-level report check, such as `is_safe_report` or
+            `is_safe_with_dampener`.
+        workers (int): Number of worker processes.
+        min_change (int): Minimum allowed absolute change.
+        max_change (int): Maximum allowed absolute change.
+        chunks_per_worker (int): Number of byte ranges per worker for load balancing.
+
+    Returns:
+        tuple[int, int]: Number of safe reports and number of reports with less than 2 levels.
+    """
+    if workers <= 0 or chunks_per_worker <= 0:
+        raise ValueError("Number of workers and chunks per worker must be positive.")
+    if min_change < 0 or max_change < 0 or min_change > max_change:
+        raise ValueError("Invalid change thresholds provided.")
+    byte_ranges = _split_byte_ranges(file_path, workers * chunks_per_worker)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(
+                _count_safe_in_range, file_path, start, stop, is_safe, min_change, max_change
+            )
+            for start, stop in byte_ranges
+        ]
+        counts = [future.result() for future in futures]
+    if not any(count[2] for count in counts):
+        raise ValueError("The provided file is empty.")
+    return sum(count[0] for count in counts), sum(count[1] for count in counts)
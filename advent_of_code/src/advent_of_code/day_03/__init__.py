@@ -1,5 +1,37 @@
-from .utils import MulStateMachine
+from .utils import (
+    MulDFA,
+    MulStateMachine,
+    close_stream,
+    iter_stream_totals,
+    load_checkpoint,
+    open_stream_reader,
+    process_file,
+    process_file_bytes,
+    process_file_parallel,
+    process_file_regex,
+    process_file_resumable,
+    process_streams,
+    save_checkpoint,
+    scan_chunk,
+    scan_mul_regex,
+    stitch_chunk_scans,
+)
 
 __all__ = [
+    "MulDFA",
     "MulStateMachine",
+    "close_stream",
+    "iter_stream_totals",
+    "load_checkpoint",
+    "open_stream_reader",
+    "process_file",
+    "process_file_bytes",
+    "process_file_parallel",
+    "process_file_regex",
+    "process_file_resumable",
+    "process_streams",
+    "save_checkpoint",
+    "scan_chunk",
+    "scan_mul_regex",
+    "stitch_chunk_scans",
 ]
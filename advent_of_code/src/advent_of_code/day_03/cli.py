@@ -1,28 +1,147 @@
+import asyncio
+import time
 import typer
+from enum import Enum
 from typing_extensions import Annotated
-from .utils import MulStateMachine
+from .utils import (
+    DEFAULT_BUFFER_SIZE,
+    MulStateMachine,
+    close_stream,
+    open_stream_reader,
+    process_file,
+    process_file_bytes,
+    process_file_parallel,
+    process_file_regex,
+    process_file_resumable,
+    process_streams,
+)
 
 app = typer.Typer(help="Day 3: Mull It Over")
 
 
+class MulEngine(str, Enum):
+    state_machine = "state-machine"
+    regex = "regex"
+    check = "check"
+
+
+BufferSizeOption = Annotated[
+    int, typer.Option("--buffer-size", help="Number of characters read from the file per block.")
+]
+EngineOption = Annotated[
+    MulEngine,
+    typer.Option(
+        "--engine",
+        help="Parser to use. 'check' runs the state machine and regex engines and compares them.",
+    ),
+]
+
+WorkersOption = Annotated[
+    int,
+    typer.Option(
+        "--workers",
+        help="Number of worker processes for the state machine. The file is read serially if 1.",
+    ),
+]
+
+ResumeOption = Annotated[
+    str | None,
+    typer.Option(
+        "--resume",
+        help=(
+            "Checkpoint file for the state machine. Only bytes appended since the last run are "
+            "read, unless the file was truncated or replaced."
+        ),
+    ),
+]
+
+BytesOption = Annotated[
+    bool,
+    typer.Option(
+        "--bytes",
+        help=(
+            "Feed the state machine raw bytes from a memory-mapped file instead of decoded "
+            "characters. Non-ASCII digits are not accepted as operands."
+        ),
+        is_flag=True,
+    ),
+]
+
+
+def run_engine(
+    data_file: str,
+    disable_dont: bool,
+    engine: MulEngine,
+    buffer_size: int,
+    workers: int,
+    resume: str | None = None,
+    use_bytes: bool = False,
+) -> int:
+    """Accumulate 'mul' products from a file with the selected engine.
+
+    Args:
+        data_file (str): Path to a file with character stream.
+        disable_dont (bool): If True, ignore 'do()' and 'don't()' toggles.
+        engine (MulEngine): Parser to use.
+        buffer_size (int): Number of characters read per block by the state machine.
+        workers (int): Number of worker processes for the state machine.
+        resume (str | None): Checkpoint file to resume the state machine from.
+        use_bytes (bool): If True, feed the state machine raw bytes instead of characters.
+
+    Returns:
+        int: The accumulated multiplication result.
+    """
+    if workers <= 0:
+        print("Error: Number of workers must be positive.")
+        raise typer.Exit(code=1)
+    if resume is not None and workers > 1:
+        print("Error: Resuming from a checkpoint is only supported with 1 worker.")
+        raise typer.Exit(code=1)
+    if engine == MulEngine.regex and (workers > 1 or resume is not None or use_bytes):
+        print("Error: The regex engine does not support --workers, --resume or --bytes.")
+        raise typer.Exit(code=1)
+    state_machine = MulStateMachine(disable_dont=disable_dont)
+    try:
+        if engine == MulEngine.regex:
+            return process_file_regex(data_file, disable_dont)
+        if resume is not None:
+            state_machine.mul, start = process_file_resumable(
+                data_file, resume, disable_dont, buffer_size
+            )
+            print(f"Resumed from byte {start}")
+        elif workers > 1:
+            state_machine.mul = process_file_parallel(data_file, disable_dont, workers)
+        elif use_bytes:
+            process_file_bytes(state_machine, data_file, buffer_size)
+        else:
+            process_file(state_machine, data_file, buffer_size)
+        if engine == MulEngine.check:
+            regex_mul = process_file_regex(data_file, disable_dont)
+            if regex_mul != state_machine.mul:
+                print(
+                    f"Error: Engines disagree. State machine: {state_machine.mul}, "
+                    f"regex: {regex_mul}"
+                )
+                raise typer.Exit(code=1)
+    except FileNotFoundError:
+        print(f"Error: The file '{data_file}' was not found.")
+    return state_machine.mul
+
+
 @app.command()
 def run_part1(
     data_file: Annotated[
         str, typer.Argument(..., help="Path to a TSV file with character stream.")
     ],
+    buffer_size: BufferSizeOption = DEFAULT_BUFFER_SIZE,
+    engine: EngineOption = MulEngine.state_machine,
+    workers: WorkersOption = 1,
+    resume: ResumeOption = None,
+    use_bytes: BytesOption = False,
 ):
     """Process data as a stream to parse and perform arithmetic operations."""
-    state_machine = MulStateMachine(disable_dont=True)
-    try:
-        with open(data_file, "r", encoding="utf-8") as f:
-            while True:
-                char = f.read(1)
-                if not char:
-                    break
-                state_machine.process_event(char)
-    except FileNotFoundError:
-        print(f"Error: The file '{data_file}' was not found.")
-    print(f"Final value: {state_machine.mul}")
+    mul = run_engine(data_file, True, engine, buffer_size, workers, resume, use_bytes)
+    print(f"Final value: {mul}")
 
 
 @app.command()
@@ -30,20 +149,102 @@ def run_part2(
     data_file: Annotated[
         str, typer.Argument(..., help="Path to a TSV file with character stream.")
     ],
+    buffer_size: BufferSizeOption = DEFAULT_BUFFER_SIZE,
+    engine: EngineOption = MulEngine.state_machine,
+    workers: WorkersOption = 1,
+    resume: ResumeOption = None,
+    use_bytes: BytesOption = False,
 ):
     """Extension of Part 1.
 
     Adds support for toggling between 'do()' and 'don't()' modes to enable or disable arithmetic
     operations.
     """
-    state_machine = MulStateMachine(disable_dont=False)
+    mul = run_engine(data_file, False, engine, buffer_size, workers, resume, use_bytes)
+    print(f"Final value: {mul}")
+
+
+@app.command()
+def run_stream(
+    sources: Annotated[
+        list[str],
+        typer.Argument(
+            ...,
+            help="Streams to parse: '-' for stdin, 'unix:PATH' for a Unix socket, or a named pipe.",
+        ),
+    ],
+    disable_dont: Annotated[
+        bool,
+        typer.Option("--disable-dont", help="Ignore 'do()' and 'don't()' toggles as in Part 1."),
+    ] = False,
+    buffer_size: BufferSizeOption = DEFAULT_BUFFER_SIZE,
+    progress: Annotated[
+        bool,
+        typer.Option("--progress", help="Print the running value of a stream after every read."),
+    ] = False,
+):
+    """Parse several streams concurrently as their data arrives."""
+
+    def print_total(index: int, total: int) -> None:
+        print(f"{sources[index]}\tRunning value: {total}", flush=True)
+
+    async def run() -> list[int]:
+        streams = []
+        try:
+            for source in sources:
+                streams.append(await open_stream_reader(source))
+        except (OSError, ValueError):
+            for _, handle in streams:
+                await close_stream(handle)
+            raise
+        readers, handles = zip(*streams)
+        on_total = print_total if progress else None
+        return await process_streams(readers, disable_dont, buffer_size, on_total, handles)
+
+    try:
+        totals = asyncio.run(run())
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}")
+        raise typer.Exit(code=1)
+    for source, total in zip(sources, totals):
+        print(f"{source}\tFinal value: {total}")
+
+
+@app.command()
+def run_benchmark(
+    data_file: Annotated[
+        str, typer.Argument(..., help="Path to a TSV file with character stream.")
+    ],
+    repeat: Annotated[
+        int, typer.Option("--repeat", help="Number of times the file contents are processed.")
+    ] = 1,
+):
+    """Measure state machine throughput in events per second.
+
+    Compares feeding one character at a time through `process_event` with feeding whole blocks
+    of characters through `process_events` and of bytes through `process_bytes`.
+    """
+    if repeat <= 0:
+        print("Error: Number of repeats must be positive.")
+        raise typer.Exit(code=1)
     try:
         with open(data_file, "r", encoding="utf-8") as f:
-            while True:
-                char = f.read(1)
-                if not char:
-                    break
-                state_machine.process_event(char)
+            data = f.read() * repeat
+        raw_data = data.encode("utf-8")
     except FileNotFoundError:
         print(f"Error: The file '{data_file}' was not found.")
-    print(f"Final value: {state_machine.mul}")
+        raise typer.Exit(code=1)
+    for mode in ["process_event", "process_events", "process_bytes"]:
+        state_machine = MulStateMachine()
+        start = time.perf_counter()
+        if mode == "process_event":
+            for event in data:
+                state_machine.process_event(event)
+        elif mode == "process_events":
+            for i in range(0, len(data), DEFAULT_BUFFER_SIZE):
+                state_machine.process_events(data[i : i + DEFAULT_BUFFER_SIZE])
+        else:
+            for i in range(0, len(raw_data), DEFAULT_BUFFER_SIZE):
+                state_machine.process_bytes(raw_data[i : i + DEFAULT_BUFFER_SIZE])
+        elapsed = time.perf_counter() - start
+        print(f"{mode}: {len(data) / elapsed:,.0f} events/s (final value: {state_machine.mul})")
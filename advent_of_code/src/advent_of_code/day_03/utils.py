@@ -1,15 +1,42 @@
 from __future__ import annotations
 from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator, Callable, Iterable
+from concurrent.futures import ProcessPoolExecutor
+import asyncio
+import codecs
+import hashlib
+import json
+import mmap
+import os
 import re
+import sys
+from typing import Any, NamedTuple
+
+# Number of characters read from a file per block
+DEFAULT_BUFFER_SIZE = 1 << 20
+
+# Number of bytes hashed at each end of the processed part of a file to detect truncation or rotation
+CHECKPOINT_DIGEST_SIZE = 4096
+
+# Complete or partial 'mul(' signals plus 'do()' and 'don't()' toggles
+MUL_TOKEN_PATTERN = re.compile(rb"mul\((\d+)(?:,(\d*)(\))?)?|do\(\)|don't\(\)")
 
 
 class MulStateMachine:
     """A finite state machine for string parsing and arithmetic on data streams.
 
+    Operands are accumulated as integers while digits arrive, so the signal is only rebuilt as a
+    string when `signal` is read. Digits are reported in ASCII.
+
     Attributes:
         _state (AbstractState): The current state of the state machine.
         _mul (int): An accumulated multiplication result from parsing 'mul([int],[int])' signals.
         signal (str): The current signal being processed.
+        signal_length (int): Length of the current signal.
+        x (int): The first operand of the current 'mul(' signal.
+        y (int): The second operand of the current 'mul(' signal.
+        x_digits (int): Number of digits read for the first operand.
+        y_digits (int): Number of digits read for the second operand.
         MAX_SIGNAL_LENGTH (int): Maximum allowed length for the signal to prevent overflow.
 
     """
@@ -19,15 +46,55 @@ class MulStateMachine:
 
     def __init__(self, disable_dont: bool = False) -> None:
         self._mul: int = 0
-        self.signal: str = ""
-        self._state: AbstractState = DoState()
-        self._state.context = self
+        self.signal_length: int = 0
+        self.x: int = 0
+        self.y: int = 0
+        self.x_digits: int = 0
+        self.y_digits: int = 0
+        # States are preallocated once per machine and reused on every transition
+        self._states: dict[type[AbstractState], AbstractState] = {}
+        for state_type in (DoState, MulState, NumState, DontState):
+            self._states[state_type] = state_type()
+            self._states[state_type].context = self
+        self._state: AbstractState = self._states[DoState]
         self.disable_dont: bool = disable_dont  # compatibility with part 1 when 'True'
+        self._dfa: MulDFA = MulDFA(disable_dont)
+
+    @property
+    def signal(self) -> str:
+        if self.signal_length == 0:
+            return ""
+        if isinstance(self._state, DoState):
+            return "don't("[: self.signal_length]
+        if isinstance(self._state, DontState):
+            return "do("[: self.signal_length]
+        if self.signal_length <= 4:
+            return "mul("[: self.signal_length]
+        signal = "mul(" + (f"{self.x:0{self.x_digits}d}" if self.x_digits else "")
+        if self.signal_length > 4 + self.x_digits:
+            signal += "," + (f"{self.y:0{self.y_digits}d}" if self.y_digits else "")
+        return signal
+
+    @signal.setter
+    def signal(self, value: str) -> None:
+        self.signal_length = len(value)
+        match = re.fullmatch(r"mul\((\d*)(?:,(\d*))?", value)
+        x, y = match.groups() if match else ("", None)
+        self.x, self.x_digits = int(x or 0), len(x)
+        self.y, self.y_digits = int(y or 0), len(y or "")
 
     def set_state(self, state: AbstractState) -> None:
         self._state = state
         self._state.context = self
 
+    def enter_state(self, state_type: type[AbstractState]) -> None:
+        """Switch to the preallocated state of the given type.
+
+        Args:
+            state_type (type[AbstractState]): The state class to switch to.
+        """
+        self._state = self._states[state_type]
+
     @property
     def mul(self) -> int:
         return self._mul
@@ -37,10 +104,853 @@ class MulStateMachine:
         self._mul = value
 
     def process_event(self, event: str) -> None:
-        if len(self.signal) > self.MAX_SIGNAL_LENGTH:
+        if self.signal_length > self.MAX_SIGNAL_LENGTH:
             raise ValueError(f"Signal length exceeded maximum limit of {self.MAX_SIGNAL_LENGTH}.")
         self._state.process_event(event)
 
+    def to_dict(self) -> dict[str, Any]:
+        """Serialize the state of the machine.
+
+        Returns:
+            dict[str, Any]: JSON-compatible state class name, signal, result and 'disable_dont'.
+        """
+        return {
+            "state": type(self._state).__name__,
+            "signal": self.signal,
+            "mul": self.mul,
+            "disable_dont": self.disable_dont,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> MulStateMachine:
+        """Restore a machine serialized with `to_dict`.
+
+        Args:
+            data (dict[str, Any]): Serialized state.
+
+        Returns:
+            MulStateMachine: A machine that continues where the serialized one stopped.
+        """
+        state_types = {state_type.__name__: state_type for state_type in _DFA_STATE_TYPES}
+        if data["state"] not in state_types:
+            raise ValueError(f"Unknown state: {data['state']}")
+        state_machine = cls(disable_dont=bool(data["disable_dont"]))
+        state_machine.enter_state(state_types[data["state"]])
+        state_machine.signal = str(data["signal"])
+        state_machine.mul = int(data["mul"])
+        return state_machine
+
+    def process_events(self, chunk: str) -> None:
+        """Process a block of characters in order.
+
+        The block is run through the table-driven `MulDFA` core, then the current state and signal
+        are copied back so that `process_event` can continue where the block ended. Falls back to
+        one `process_event` call per character if the state was set to something the DFA does not
+        model.
+
+        Args:
+            chunk (str): Characters to feed to the state machine.
+        """
+        dfa = self._dfa
+        if not dfa.load(type(self._state), self.signal, self.mul, self.disable_dont):
+            process_event = self.process_event
+            for event in chunk:
+                process_event(event)
+            return
+        try:
+            dfa.process_events(chunk)
+        finally:
+            self._store_dfa(chunk[max(dfa.consumed - dfa.length, 0) : dfa.consumed])
+
+    def process_bytes(self, buffer: bytes | bytearray | memoryview | mmap.mmap) -> None:
+        """Process a block of ASCII-encoded bytes in order without decoding them.
+
+        Dispatches on integer byte values through the `MulDFA` core. Every non-ASCII byte is an
+        ordinary character, so unlike `process_events`, non-ASCII decimal digits are not accepted
+        as operands.
+
+        Args:
+            buffer (bytes | bytearray | memoryview | mmap.mmap): Bytes to feed to the state machine.
+        """
+        dfa = self._dfa
+        if not dfa.load(type(self._state), self.signal, self.mul, self.disable_dont):
+            # Latin-1 maps each byte to one character and none of 0x80-0xFF are decimal digits
+            self.process_events(bytes(buffer).decode("latin-1"))
+            return
+        try:
+            dfa.process_bytes(buffer)
+        finally:
+            tail = buffer[max(dfa.consumed - dfa.length, 0) : dfa.consumed]
+            self._store_dfa(bytes(tail).decode("ascii"))
+
+    def _store_dfa(self, tail: str) -> None:
+        """Copy the state, signal and result of the DFA core back to the machine.
+
+        Args:
+            tail (str): The last characters processed by the DFA, up to its signal length.
+        """
+        dfa = self._dfa
+        self.mul = dfa.mul
+        self.enter_state(_DFA_STATE_TYPES[dfa.state])
+        if dfa.length <= len(tail):
+            self.signal = tail[len(tail) - dfa.length :]
+        else:
+            # No reset within the block, so the whole block extends the previous signal
+            self.signal = self.signal + tail
+
+
+# DFA state IDs. The signal consumed so far is implied by the state and operand values.
+(
+    DFA_DO,  # DoState, ''
+    DFA_DO_D,  # DoState, 'd'
+    DFA_DO_DO,  # DoState, 'do'
+    DFA_DO_DON,  # DoState, 'don'
+    DFA_DO_DON_Q,  # DoState, "don'"
+    DFA_DO_DONT,  # DoState, "don't"
+    DFA_DO_DONT_P,  # DoState, "don't("
+    DFA_MUL_M,  # MulState, 'm'
+    DFA_MUL_MU,  # MulState, 'mu'
+    DFA_MUL_MUL,  # MulState, 'mul'
+    DFA_NUM_OPEN,  # NumState, 'mul('
+    DFA_NUM_X,  # NumState, 'mul(x'
+    DFA_MUL_COMMA,  # MulState, 'mul(x,'
+    DFA_NUM_Y,  # NumState, 'mul(x,y'
+    DFA_DONT,  # DontState, ''
+    DFA_DONT_D,  # DontState, 'd'
+    DFA_DONT_DO,  # DontState, 'do'
+    DFA_DONT_DO_P,  # DontState, 'do('
+) = range(18)
+DFA_NUM_STATES = 18
+
+# Character classes. Digits map to their own value so that actions can read it back.
+CLASS_OTHER = 10
+_CLASS_CHARS = "mul(,)don't"
+DFA_NUM_CLASSES = CLASS_OTHER + len(_CLASS_CHARS) + 1
+_ASCII_CLASSES = [CLASS_OTHER] * 128
+for _digit in range(10):
+    _ASCII_CLASSES[ord(str(_digit))] = _digit
+for _ch in _CLASS_CHARS:
+    _ASCII_CLASSES[ord(_ch)] = CLASS_OTHER + 1 + _CLASS_CHARS.index(_ch)
+_BYTE_CLASSES = _ASCII_CLASSES + [CLASS_OTHER] * 128
+
+# Transition actions
+ACTION_RESET = 0  # clear the signal
+ACTION_START = 1  # the current character starts a new signal
+ACTION_APPEND = 2  # append the current character to the signal
+ACTION_DIGIT_X = 3  # append a digit to the first operand
+ACTION_DIGIT_Y = 4  # append a digit to the second operand
+ACTION_EMIT = 5  # add the product of the operands and clear the signal
+
+
+def _char_class(ch: str) -> int:
+    return _ASCII_CLASSES[ord(ch)]
+
+
+def _build_transitions(disable_dont: bool) -> tuple[list[int], list[int]]:
+    """Build flat `(state, character class) -> next state, action` tables.
+
+    The tables encode the transitions of `DoState`, `MulState`, `NumState` and `DontState`,
+    including rejected characters being consumed rather than reprocessed.
+
+    Args:
+        disable_dont (bool): If True, ignore 'do()' and 'don't()' toggles.
+
+    Returns:
+        tuple[list[int], list[int]]: Next state and action, indexed by
+            `state * DFA_NUM_CLASSES + character class`.
+    """
+    next_states = [DFA_DO] * (DFA_NUM_STATES * DFA_NUM_CLASSES)
+    actions = [ACTION_RESET] * (DFA_NUM_STATES * DFA_NUM_CLASSES)
+
+    def set_transition(state: int, ch: str | int, next_state: int, action: int) -> None:
+        cls = ch if isinstance(ch, int) else _char_class(ch)
+        next_states[state * DFA_NUM_CLASSES + cls] = next_state
+        actions[state * DFA_NUM_CLASSES + cls] = action
+
+    # DoState
+    set_transition(DFA_DO, "m", DFA_MUL_M, ACTION_START)
+    if not disable_dont:
+        set_transition(DFA_DO, "d", DFA_DO_D, ACTION_START)
+    # Only reachable with 'disable_dont' if a 'd' signal was set by hand, as in DoState
+    for state, ch in zip(range(DFA_DO_D, DFA_DO_DONT_P), "on't("):
+        set_transition(state, ch, state + 1, ACTION_APPEND)
+    set_transition(DFA_DO_DONT_P, ")", DFA_DONT, ACTION_RESET)
+    # MulState and NumState
+    set_transition(DFA_MUL_M, "u", DFA_MUL_MU, ACTION_APPEND)
+    set_transition(DFA_MUL_MU, "l", DFA_MUL_MUL, ACTION_APPEND)
+    set_transition(DFA_MUL_MUL, "(", DFA_NUM_OPEN, ACTION_APPEND)
+    for digit in range(10):
+        set_transition(DFA_NUM_OPEN, digit, DFA_NUM_X, ACTION_DIGIT_X)
+        set_transition(DFA_NUM_X, digit, DFA_NUM_X, ACTION_DIGIT_X)
+        set_transition(DFA_MUL_COMMA, digit, DFA_NUM_Y, ACTION_DIGIT_Y)
+        set_transition(DFA_NUM_Y, digit, DFA_NUM_Y, ACTION_DIGIT_Y)
+    set_transition(DFA_NUM_X, ",", DFA_MUL_COMMA, ACTION_APPEND)
+    set_transition(DFA_NUM_Y, ")", DFA_DO, ACTION_EMIT)
+    if not disable_dont:
+        for state in range(DFA_MUL_M, DFA_NUM_Y + 1):
+            set_transition(state, "d", DFA_DO_D, ACTION_START)
+    # DontState
+    for cls in range(DFA_NUM_CLASSES):
+        for state in range(DFA_DONT, DFA_DONT_DO_P + 1):
+            set_transition(state, cls, DFA_DONT, ACTION_RESET)
+    set_transition(DFA_DONT, "d", DFA_DONT_D, ACTION_START)
+    set_transition(DFA_DONT_D, "o", DFA_DONT_DO, ACTION_APPEND)
+    set_transition(DFA_DONT_DO, "(", DFA_DONT_DO_P, ACTION_APPEND)
+    set_transition(DFA_DONT_DO_P, ")", DFA_DO, ACTION_RESET)
+    return next_states, actions
+
+
+_TRANSITIONS = {disable_dont: _build_transitions(disable_dont) for disable_dont in (False, True)}
+
+
+class MulDFA:
+    """Table-driven equivalent of `MulStateMachine` with integer states and no per-event allocation.
+
+    Attributes:
+        state (int): The current DFA state ID.
+        length (int): Length of the signal consumed in the current state.
+        x (int): The first operand of a partial 'mul(' signal.
+        y (int): The second operand of a partial 'mul(' signal.
+        mul (int): An accumulated multiplication result from parsing 'mul([int],[int])' signals.
+        disable_dont (bool): If True, ignore 'do()' and 'don't()' toggles.
+        consumed (int): Number of characters processed by the last `process_events` call.
+    """
+
+    MAX_SIGNAL_LENGTH = MulStateMachine.MAX_SIGNAL_LENGTH
+
+    def __init__(self, disable_dont: bool = False) -> None:
+        self.state: int = DFA_DO
+        self.length: int = 0
+        self.x: int = 0
+        self.y: int = 0
+        self.mul: int = 0
+        self.disable_dont: bool = disable_dont
+        self.consumed: int = 0
+
+    def load(self, state_type: type, signal: str, mul: int, disable_dont: bool) -> bool:
+        """Set the DFA to the configuration of a class-based state and signal.
+
+        Args:
+            state_type (type): Type of the current `MulStateMachine` state.
+            signal (str): The current signal of the `MulStateMachine`.
+            mul (int): The accumulated multiplication result.
+            disable_dont (bool): If True, ignore 'do()' and 'don't()' toggles.
+
+        Returns:
+            bool: False if the state and signal do not correspond to a DFA state.
+        """
+        if state_type is DoState or state_type is DontState:
+            prefixes = "don't(" if state_type is DoState else "do("
+            if not prefixes.startswith(signal):
+                return False
+            offset = DFA_DO if state_type is DoState else DFA_DONT
+            self.state, self.x, self.y = offset + len(signal), 0, 0
+        elif state_type is MulState and signal in ("m", "mu", "mul"):
+            self.state, self.x, self.y = DFA_MUL_M + len(signal) - 1, 0, 0
+        else:
+            match = re.fullmatch(r"mul\((\d*)(,(\d*))?", signal)
+            if state_type not in (MulState, NumState) or match is None:
+                return False
+            x, comma, y = match.groups()
+            if state_type is MulState:
+                if not x or comma is None or y:
+                    return False
+                self.state = DFA_MUL_COMMA
+            elif comma is None:
+                self.state = DFA_NUM_X if x else DFA_NUM_OPEN
+            elif x and y:
+                self.state = DFA_NUM_Y
+            else:
+                return False
+            self.x, self.y = int(x or 0), int(y or 0)
+        self.length = len(signal)
+        self.mul = mul
+        self.disable_dont = disable_dont
+        return True
+
+    def process_events(self, chunk: str) -> None:
+        """Process a block of characters in order.
+
+        Args:
+            chunk (str): Characters to feed to the DFA.
+        """
+        next_states, actions = _TRANSITIONS[self.disable_dont]
+        ascii_classes = _ASCII_CLASSES
+        max_length = self.MAX_SIGNAL_LENGTH
+        state, length, x, y, mul = self.state, self.length, self.x, self.y, self.mul
+        events = iter(chunk)
+        unprocessed = 0
+        for ch in events:
+            if length > max_length:
+                unprocessed = sum(1 for _ in events) + 1
+                break
+            code = ord(ch)
+            if code < 128:
+                cls = ascii_classes[code]
+            else:
+                cls = int(ch) if ch.isdecimal() else CLASS_OTHER
+            index = state * DFA_NUM_CLASSES + cls
+            action = actions[index]
+            state = next_states[index]
+            if action == ACTION_RESET:
+                length = 0
+            elif action == ACTION_APPEND:
+                length += 1
+            elif action == ACTION_DIGIT_X:
+                length += 1
+                x = x * 10 + cls
+            elif action == ACTION_DIGIT_Y:
+                length += 1
+                y = y * 10 + cls
+            elif action == ACTION_START:
+                length, x, y = 1, 0, 0
+            else:
+                mul += x * y
+                length = 0
+        self.state, self.length, self.x, self.y, self.mul = state, length, x, y, mul
+        self.consumed = len(chunk) - unprocessed
+        if unprocessed:
+            raise ValueError(f"Signal length exceeded maximum limit of {max_length}.")
+
+    def process_bytes(self, buffer: bytes | bytearray | memoryview | mmap.mmap) -> None:
+        """Process a block of ASCII-encoded bytes in order.
+
+        Same loop as `process_events`, specialised to integer byte values so that no characters
+        are decoded. Non-ASCII bytes are ordinary characters.
+
+        Args:
+            buffer (bytes | bytearray | memoryview | mmap.mmap): Bytes to feed to the DFA.
+        """
+        next_states, actions = _TRANSITIONS[self.disable_dont]
+        byte_classes = _BYTE_CLASSES
+        max_length = self.MAX_SIGNAL_LENGTH
+        state, length, x, y, mul = self.state, self.length, self.x, self.y, self.mul
+        events = iter(memoryview(buffer).cast("B"))
+        unprocessed = 0
+        for code in events:
+            if length > max_length:
+                unprocessed = sum(1 for _ in events) + 1
+                break
+            cls = byte_classes[code]
+            index = state * DFA_NUM_CLASSES + cls
+            action = actions[index]
+            state = next_states[index]
+            if action == ACTION_RESET:
+                length = 0
+            elif action == ACTION_APPEND:
+                length += 1
+            elif action == ACTION_DIGIT_X:
+                length += 1
+                x = x * 10 + cls
+            elif action == ACTION_DIGIT_Y:
+                length += 1
+                y = y * 10 + cls
+            elif action == ACTION_START:
+                length, x, y = 1, 0, 0
+            else:
+                mul += x * y
+                length = 0
+        self.state, self.length, self.x, self.y, self.mul = state, length, x, y, mul
+        self.consumed = len(buffer) - unprocessed
+        if unprocessed:
+            raise ValueError(f"Signal length exceeded maximum limit of {max_length}.")
+
+
+def process_file(
+    state_machine: MulStateMachine, file_path: str, buffer_size: int = DEFAULT_BUFFER_SIZE
+) -> int:
+    """Feed a text file to a state machine in fixed-size blocks.
+
+    Args:
+        state_machine (MulStateMachine): The state machine to feed.
+        file_path (str): Path to the text file.
+        buffer_size (int): Number of characters read per block.
+
+    Returns:
+        int: The accumulated multiplication result of the state machine.
+    """
+    if buffer_size <= 0:
+        raise ValueError("Buffer size must be positive.")
+    with open(file_path, "r", encoding="utf-8") as f:
+        while chunk := f.read(buffer_size):
+            state_machine.process_events(chunk)
+    return state_machine.mul
+
+
+def process_file_bytes(
+    state_machine: MulStateMachine, file_path: str, buffer_size: int = DEFAULT_BUFFER_SIZE
+) -> int:
+    """Feed a memory-mapped file to a state machine in fixed-size blocks of raw bytes.
+
+    Args:
+        state_machine (MulStateMachine): The state machine to feed.
+        file_path (str): Path to the ASCII text file.
+        buffer_size (int): Number of bytes per block.
+
+    Returns:
+        int: The accumulated multiplication result of the state machine.
+    """
+    if buffer_size <= 0:
+        raise ValueError("Buffer size must be positive.")
+    with open(file_path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return state_machine.mul
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            for start in range(0, size, buffer_size):
+                state_machine.process_bytes(buffer[start : start + buffer_size])
+    return state_machine.mul
+
+
+def _file_digests(file_path: str, offset: int) -> list[str]:
+    """Hash the first and last bytes of a file before an offset.
+
+    Args:
+        file_path (str): Path to the file.
+        offset (int): Byte offset marking the end of the hashed part.
+
+    Returns:
+        list[str]: Hex digests of the head and tail of the first `offset` bytes.
+    """
+    size = min(offset, CHECKPOINT_DIGEST_SIZE)
+    with open(file_path, "rb") as fh:
+        head = fh.read(size)
+        fh.seek(offset - size)
+        tail = fh.read(size)
+    return [hashlib.sha256(head).hexdigest(), hashlib.sha256(tail).hexdigest()]
+
+
+def save_checkpoint(
+    state_file: str, state_machine: MulStateMachine, file_path: str, offset: int
+) -> None:
+    """Write the state of a machine and the processed part of its input to a JSON file.
+
+    The file is replaced atomically, so an interrupted run leaves the previous checkpoint intact.
+
+    Args:
+        state_file (str): Path to the checkpoint file.
+        state_machine (MulStateMachine): The state machine to save.
+        file_path (str): Path to the input file.
+        offset (int): Number of bytes of the input file processed by the state machine.
+    """
+    checkpoint = {
+        "machine": state_machine.to_dict(),
+        "offset": offset,
+        "digests": _file_digests(file_path, offset),
+    }
+    tmp_file = f"{state_file}.tmp"
+    with open(tmp_file, "w", encoding="utf-8") as fh:
+        json.dump(checkpoint, fh)
+    os.replace(tmp_file, state_file)
+
+
+def load_checkpoint(
+    state_file: str, file_path: str, disable_dont: bool = False
+) -> tuple[MulStateMachine, int] | None:
+    """Restore a state machine saved with `save_checkpoint` if it still applies to the input.
+
+    Args:
+        state_file (str): Path to the checkpoint file.
+        file_path (str): Path to the input file.
+        disable_dont (bool): Mode the restored machine must have been run in.
+
+    Returns:
+        tuple[MulStateMachine, int] | None: The restored machine and the byte offset to resume
+            from. None if there is no usable checkpoint, or if the input was truncated or replaced
+            since it was written.
+    """
+    try:
+        with open(state_file, "r", encoding="utf-8") as fh:
+            checkpoint = json.load(fh)
+        state_machine = MulStateMachine.from_dict(checkpoint["machine"])
+        offset = int(checkpoint["offset"])
+        digests = checkpoint["digests"]
+    except (FileNotFoundError, ValueError, KeyError, TypeError):
+        return None
+    if state_machine.disable_dont != disable_dont or offset > os.path.getsize(file_path):
+        return None
+    if _file_digests(file_path, offset) != digests:
+        return None
+    return state_machine, offset
+
+
+def process_file_resumable(
+    file_path: str,
+    state_file: str,
+    disable_dont: bool = False,
+    buffer_size: int = DEFAULT_BUFFER_SIZE,
+) -> tuple[int, int]:
+    """Feed a growing file to a state machine, resuming from the last checkpoint.
+
+    Only bytes appended since the checkpoint in `state_file` was written are read. The whole file
+    is rescanned if the checkpoint is missing or the file was truncated or rotated. A new
+    checkpoint is written after the file is processed.
+
+    Args:
+        file_path (str): Path to the text file.
+        state_file (str): Path to the checkpoint file.
+        disable_dont (bool): If True, ignore 'do()' and 'don't()' toggles.
+        buffer_size (int): Number of bytes read per block.
+
+    Returns:
+        tuple[int, int]: The accumulated multiplication result and the byte offset processing
+            resumed from.
+    """
+    if buffer_size <= 0:
+        raise ValueError("Buffer size must be positive.")
+    restored = load_checkpoint(state_file, file_path, disable_dont)
+    state_machine, start = restored or (MulStateMachine(disable_dont), 0)
+    # Bytes of a character cut off at the end of the file are left for the next run
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    offset = start
+    with open(file_path, "rb") as fh:
+        fh.seek(start)
+        while data := fh.read(buffer_size):
+            state_machine.process_events(decoder.decode(data))
+            offset += len(data)
+    offset -= len(decoder.getstate()[0])
+    save_checkpoint(state_file, state_machine, file_path, offset)
+    return state_machine.mul, start
+
+
+async def iter_stream_totals(
+    reader: asyncio.StreamReader,
+    disable_dont: bool = False,
+    buffer_size: int = DEFAULT_BUFFER_SIZE,
+) -> AsyncIterator[int]:
+    """Feed an asyncio stream to a state machine and yield the running result after each read.
+
+    Reads wait until data is available, so a slow consumer of the yielded totals also slows down
+    reading and lets the stream's flow control pause the writer.
+
+    Args:
+        reader (asyncio.StreamReader): Stream of UTF-8 encoded text.
+        disable_dont (bool): If True, ignore 'do()' and 'don't()' toggles.
+        buffer_size (int): Maximum number of bytes read at a time.
+
+    Yields:
+        int: The accumulated multiplication result after each block.
+    """
+    if buffer_size <= 0:
+        raise ValueError("Buffer size must be positive.")
+    state_machine = MulStateMachine(disable_dont)
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    while data := await reader.read(buffer_size):
+        state_machine.process_events(decoder.decode(data))
+        yield state_machine.mul
+    state_machine.process_events(decoder.decode(b"", final=True))
+    yield state_machine.mul
+
+
+async def process_streams(
+    readers: Iterable[asyncio.StreamReader],
+    disable_dont: bool = False,
+    buffer_size: int = DEFAULT_BUFFER_SIZE,
+    on_total: Callable[[int, int], None] | None = None,
+    handles: Iterable[StreamHandle | None] | None = None,
+) -> list[int]:
+    """Run an independent state machine over each of several streams in the current event loop.
+
+    Args:
+        readers (Iterable[asyncio.StreamReader]): Streams of UTF-8 encoded text.
+        disable_dont (bool): If True, ignore 'do()' and 'don't()' toggles.
+        buffer_size (int): Maximum number of bytes read at a time from each stream.
+        on_total (Callable[[int, int], None] | None): Called with the index of a stream and its
+            running result after each block read from it.
+        handles (Iterable[StreamHandle | None] | None): Handles from `open_stream_reader`, one
+            per reader, each closed once its stream is consumed.
+
+    Returns:
+        list[int]: The accumulated multiplication result of each stream.
+    """
+    readers = list(readers)
+    handles = [None] * len(readers) if handles is None else list(handles)
+    if len(handles) != len(readers):
+        raise ValueError("Expected one handle per reader.")
+
+    async def consume(index: int, reader: asyncio.StreamReader, handle: StreamHandle | None) -> int:
+        total = 0
+        try:
+            async for total in iter_stream_totals(reader, disable_dont, buffer_size):
+                if on_total is not None:
+                    on_total(index, total)
+        finally:
+            if handle is not None:
+                await close_stream(handle)
+        return total
+
+    return list(
+        await asyncio.gather(
+            *(consume(i, *stream) for i, stream in enumerate(zip(readers, handles)))
+        )
+    )
+
+
+# Closeable end of a stream opened by `open_stream_reader`
+StreamHandle = asyncio.StreamWriter | asyncio.BaseTransport
+
+
+async def close_stream(handle: StreamHandle) -> None:
+    """Close the connection or pipe behind a stream opened by `open_stream_reader`.
+
+    Args:
+        handle (StreamHandle): The handle returned alongside the reader.
+    """
+    handle.close()
+    if isinstance(handle, asyncio.StreamWriter):
+        await handle.wait_closed()
+
+
+async def open_stream_reader(source: str) -> tuple[asyncio.StreamReader, StreamHandle]:
+    """Open a stream reader on standard input, a Unix domain socket or a named pipe.
+
+    Args:
+        source (str): '-' for standard input, 'unix:PATH' for a Unix domain socket, or the path
+            to a named pipe.
+
+    Returns:
+        tuple[asyncio.StreamReader, StreamHandle]: Reader for the source, and the handle to pass
+            to `close_stream` (or `process_streams`) once it is consumed.
+    """
+    if source.startswith("unix:"):
+        # The socket stays half-open after EOF until the writer is closed
+        return await asyncio.open_unix_connection(source.removeprefix("unix:"))
+    loop = asyncio.get_running_loop()
+    reader = asyncio.StreamReader()
+    # Opening a named pipe blocks until a writer connects
+    pipe = sys.stdin.buffer if source == "-" else await asyncio.to_thread(open, source, "rb")
+    try:
+        transport, _ = await loop.connect_read_pipe(
+            lambda: asyncio.StreamReaderProtocol(reader), pipe
+        )
+    except (OSError, ValueError):
+        # Regular files are rejected, and standard input is left open for the caller
+        if source != "-":
+            pipe.close()
+        raise
+    return reader, transport
+
+
+# Final DFA configuration of a chunk: accumulated result, state, signal length and operands
+DFAResult = tuple[int, int, int, int, int]
+
+
+class ChunkScan(NamedTuple):
+    """Result of scanning one chunk of a file independently of the chunks before it.
+
+    Attributes:
+        prefix (str): Characters up to and including the first character that resets the signal
+            from any state. Must be replayed from the real entry configuration.
+        results (dict[int, DFAResult | None]): For each mode the prefix can leave the DFA in
+            (`DFA_DO` or `DFA_DONT`), the result of running the rest of the chunk. None if the
+            rest of the chunk exceeds `MAX_SIGNAL_LENGTH`. Empty if the whole chunk is prefix.
+    """
+
+    prefix: str
+    results: dict[int, DFAResult | None]
+
+
+def _is_reset_char(ch: str) -> bool:
+    code = ord(ch)
+    if code < 128:
+        return _ASCII_CLASSES[code] == CLASS_OTHER
+    return not ch.isdecimal()
+
+
+def scan_chunk(chunk: str, disable_dont: bool = False, block_size: int = 1 << 16) -> ChunkScan:
+    """Run the DFA over a chunk from every configuration it can be in after the chunk's prefix.
+
+    Any character outside 'mul(,)don't' and the digits clears the signal, so after the first one
+    the DFA is in `DFA_DO` or `DFA_DONT` with no partial signal. The rest of the chunk is run
+    from both modes in lockstep blocks until the two runs reach the same configuration, after
+    which only one is continued.
+
+    Args:
+        chunk (str): Characters to scan.
+        disable_dont (bool): If True, ignore 'do()' and 'don't()' toggles.
+        block_size (int): Number of characters run between convergence checks.
+
+    Returns:
+        ChunkScan: The prefix to replay and the result for each entry mode.
+    """
+    split = next((i + 1 for i, ch in enumerate(chunk) if _is_reset_char(ch)), None)
+    if split is None:
+        return ChunkScan(chunk, {})
+    entry_states = [DFA_DO] if disable_dont else [DFA_DO, DFA_DONT]
+    runs = {}
+    for entry_state in entry_states:
+        runs[entry_state] = MulDFA(disable_dont)
+        runs[entry_state].state = entry_state
+    overflowed = set()
+    follows_do = None  # offset of the 'DFA_DONT' result once it has converged with 'DFA_DO'
+    for i in range(split, len(chunk), block_size):
+        block = chunk[i : i + block_size]
+        for entry_state, dfa in runs.items():
+            if entry_state not in overflowed:
+                try:
+                    dfa.process_events(block)
+                except ValueError:
+                    overflowed.add(entry_state)
+        if follows_do is None and len(runs) == 2 and not overflowed:
+            do_run, dont_run = runs[DFA_DO], runs[DFA_DONT]
+            do_config = (do_run.state, do_run.length, do_run.x, do_run.y)
+            if do_config == (dont_run.state, dont_run.length, dont_run.x, dont_run.y):
+                follows_do = dont_run.mul - do_run.mul
+                del runs[DFA_DONT]
+    results: dict[int, DFAResult | None] = {}
+    for entry_state, dfa in runs.items():
+        if entry_state in overflowed:
+            results[entry_state] = None
+        else:
+            results[entry_state] = (dfa.mul, dfa.state, dfa.length, dfa.x, dfa.y)
+    if follows_do is not None:
+        do_result = results[DFA_DO]
+        results[DFA_DONT] = (
+            None if do_result is None else (do_result[0] + follows_do, *do_result[1:])
+        )
+    return ChunkScan(chunk[:split], results)
+
+
+def stitch_chunk_scans(scans: Iterable[ChunkScan], disable_dont: bool = False) -> int:
+    """Combine chunk scans from left to right into the total of a sequential run.
+
+    Args:
+        scans (Iterable[ChunkScan]): Scans of consecutive chunks, in order.
+        disable_dont (bool): If True, ignore 'do()' and 'don't()' toggles.
+
+    Returns:
+        int: The accumulated multiplication result.
+    """
+    dfa = MulDFA(disable_dont)
+    for scan in scans:
+        dfa.process_events(scan.prefix)
+        if not scan.results:
+            continue
+        result = scan.results[dfa.state]
+        if result is None:
+            raise ValueError(f"Signal length exceeded maximum limit of {dfa.MAX_SIGNAL_LENGTH}.")
+        mul, dfa.state, dfa.length, dfa.x, dfa.y = result
+        dfa.mul += mul
+    return dfa.mul
+
+
+def _split_utf8_ranges(file_path: str, n_ranges: int) -> list[tuple[int, int]]:
+    """Split a file into contiguous byte ranges that do not cut UTF-8 encoded characters.
+
+    Args:
+        file_path (str): Path to the file.
+        n_ranges (int): Target number of ranges. Fewer are returned for small files.
+
+    Returns:
+        list[tuple[int, int]]: Start and stop byte offsets of each range.
+    """
+    size = os.path.getsize(file_path)
+    boundaries = [0]
+    with open(file_path, "rb") as fh:
+        for i in range(1, n_ranges):
+            position = max(size * i // n_ranges, boundaries[-1])
+            fh.seek(position)
+            # Skip continuation bytes (0b10xxxxxx) to the start of the next character
+            while (byte := fh.read(1)) and byte[0] & 0xC0 == 0x80:
+                position += 1
+            if boundaries[-1] < position < size:
+                boundaries.append(position)
+    boundaries.append(size)
+    return list(zip(boundaries[:-1], boundaries[1:]))
+
+
+def _scan_byte_range(file_path: str, start: int, stop: int, disable_dont: bool) -> ChunkScan:
+    with open(file_path, "rb") as fh:
+        fh.seek(start)
+        data = fh.read(stop - start)
+    return scan_chunk(data.decode("utf-8"), disable_dont)
+
+
+def process_file_parallel(
+    file_path: str, disable_dont: bool = False, workers: int = 1, chunks_per_worker: int = 4
+) -> int:
+    """Accumulate 'mul([int],[int])' products from a file using a pool of worker processes.
+
+    The file is split into byte ranges that are scanned independently with `scan_chunk` and
+    stitched together with `stitch_chunk_scans`, so that signals and toggles straddling range
+    boundaries are handled as in a sequential run.
+
+    Args:
+        file_path (str): Path to the text file.
+        disable_dont (bool): If True, ignore 'do()' and 'don't()' toggles.
+        workers (int): Number of worker processes.
+        chunks_per_worker (int): Number of byte ranges per worker for load balancing.
+
+    Returns:
+        int: The accumulated multiplication result.
+    """
+    if workers <= 0 or chunks_per_worker <= 0:
+        raise ValueError("Number of workers and chunks per worker must be positive.")
+    byte_ranges = _split_utf8_ranges(file_path, workers * chunks_per_worker)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(_scan_byte_range, file_path, start, stop, disable_dont)
+            for start, stop in byte_ranges
+        ]
+        return stitch_chunk_scans((future.result() for future in futures), disable_dont)
+
+
+def scan_mul_regex(
+    buffer: bytes | bytearray | memoryview | mmap.mmap,
+    disable_dont: bool = False,
+    max_signal_length: int = MulStateMachine.MAX_SIGNAL_LENGTH,
+) -> int:
+    """Accumulate 'mul([int],[int])' products from a byte buffer with a compiled regex.
+
+    Operands of any length are matched so that signals longer than `max_signal_length` raise an
+    error, as they do in `MulStateMachine`. Unlike the state machine, scanning resumes at the
+    character that broke a partial signal, so inputs such as 'mmul(2,3)' can yield tokens the
+    state machine drops.
+
+    Args:
+        buffer (bytes | bytearray | memoryview | mmap.mmap): ASCII input data.
+        disable_dont (bool): If True, ignore 'do()' and 'don't()' toggles.
+        max_signal_length (int): Maximum allowed length of a signal before its closing ')'.
+
+    Returns:
+        int: The accumulated multiplication result.
+    """
+    total = 0
+    is_enabled = True
+    size = len(buffer)
+    for match in MUL_TOKEN_PATTERN.finditer(buffer):
+        token = match.group(0)
+        if token == b"do()":
+            is_enabled = True
+        elif token == b"don't()":
+            is_enabled = disable_dont
+        elif is_enabled:
+            is_complete = match.group(3) is not None and match.group(2) != b""
+            signal_length = len(token) - 1 if match.group(3) is not None else len(token)
+            # The state machine raises on the event after the signal outgrows the limit
+            if signal_length > max_signal_length and (is_complete or match.end() < size):
+                raise ValueError(f"Signal length exceeded maximum limit of {max_signal_length}.")
+            if is_complete:
+                total += int(match.group(1)) * int(match.group(2))
+    return total
+
+
+def process_file_regex(file_path: str, disable_dont: bool = False) -> int:
+    """Accumulate 'mul([int],[int])' products from a memory-mapped file with a compiled regex.
+
+    Args:
+        file_path (str): Path to the text file.
+        disable_dont (bool): If True, ignore 'do()' and 'don't()' toggles.
+
+    Returns:
+        int: The accumulated multiplication result.
+    """
+    with open(file_path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return 0
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            return scan_mul_regex(buffer, disable_dont)
+
 
 class AbstractState(ABC):
 
@@ -57,101 +967,108 @@ class AbstractState(ABC):
         pass
 
     def _reject(self) -> None:
-        self.context.signal = ""
+        self.context.signal_length = 0
 
     def _accept(self, ch: str) -> None:
-        self.context.signal += ch
+        self.context.signal_length += 1
+
+    def _restart(self) -> None:
+        # A 'd' may start a 'do()' or 'don't()' signal in the middle of a 'mul(' signal
+        self.context.signal_length = 1
+        self.context.enter_state(DoState)
 
 
 class MulState(AbstractState):
     """State class for handling 'mul(' prefix and ',' number delimiter."""
 
     def process_event(self, event: str) -> None:
+        context = self.context
         match event:
-            case "u" if self.context.signal == "m":
+            case "u" if context.signal_length == 1:
                 self._accept(event)
-            case "l" if self.context.signal == "mu":
+            case "l" if context.signal_length == 2:
                 self._accept(event)
-            case "(" if self.context.signal == "mul":
+            case "(" if context.signal_length == 3:
                 self._accept(event)
-                self.context.set_state(NumState())
-            case "d" if not self.context.disable_dont:
-                self.context.signal = ""
-                self._accept(event)
-                self.context.set_state(DoState())
+                context.enter_state(NumState)
+            case "d" if not context.disable_dont:
+                self._restart()
             # Switch back to NumState after comma
-            case _ if re.match(r"\d", event):
-                if re.match(r"mul\(\d+,$", self.context.signal):
+            case _ if event.isdecimal():
+                if context.signal_length > 3:
+                    context.y = int(event)
+                    context.y_digits = 1
                     self._accept(event)
-                    self.context.set_state(NumState())
+                    context.enter_state(NumState)
                 else:
                     self._reject()
             case _:
                 self._reject()
 
     def _reject(self) -> None:
-        self.context.signal = ""
-        self.context.set_state(DoState())
+        self.context.signal_length = 0
+        self.context.enter_state(DoState)
 
 
 class NumState(AbstractState):
 
     def process_event(self, event: str) -> None:
+        context = self.context
+        has_comma = context.signal_length > 4 + context.x_digits
         match event:
-            case "," if re.match(r"mul\(\d+$", self.context.signal):
-                self._accept(event)
-                self.context.set_state(MulState())
-            case ")" if re.match(r"mul\(\d+,\d+$", self.context.signal):
+            case "," if context.x_digits > 0 and not has_comma:
                 self._accept(event)
+                context.enter_state(MulState)
+            case ")" if has_comma and context.y_digits > 0:
                 self._process_signal()
-            case "d" if not self.context.disable_dont:
-                self.context.signal = ""
-                self._accept(event)
-                self.context.set_state(DoState())
-            case _ if re.match(r"\d", event):
+            case "d" if not context.disable_dont:
+                self._restart()
+            case _ if event.isdecimal():
+                if has_comma:
+                    context.y = context.y * 10 + int(event)
+                    context.y_digits += 1
+                else:
+                    context.x = context.x * 10 + int(event)
+                    context.x_digits += 1
                 self._accept(event)
             case _:
                 self._reject()
 
     def _reject(self) -> None:
-        self.context.signal = ""
-        self.context.set_state(DoState())
+        self.context.signal_length = 0
+        self.context.enter_state(DoState)
 
     def _process_signal(self) -> None:
-        match = re.match(r"mul\((\d+),(\d+)\)", self.context.signal)
-        if match:
-            first_num = int(match.group(1))
-            second_num = int(match.group(2))
-            self.context.mul += first_num * second_num
-        else:
-            raise ValueError(f"Invalid signal format: {self.context.signal}")
-        self.context.signal = ""
-        self.context.set_state(DoState())
+        self.context.mul += self.context.x * self.context.y
+        self.context.signal_length = 0
+        self.context.enter_state(DoState)
 
 
 class DoState(AbstractState):
 
     def process_event(self, event: str) -> None:
+        context = self.context
         match event:
-            case "m" if self.context.signal == "":
+            case "m" if context.signal_length == 0:
+                context.x, context.y, context.x_digits, context.y_digits = 0, 0, 0, 0
                 self._accept(event)
-                self.context.set_state(MulState())
-            case "d" if self.context.signal == "" and not self.context.disable_dont:
+                context.enter_state(MulState)
+            case "d" if context.signal_length == 0 and not context.disable_dont:
                 self._accept(event)
             # Can only enter remaining cases if 'disable_dont' is False
-            case "o" if self.context.signal == "d":
+            case "o" if context.signal_length == 1:
                 self._accept(event)
-            case "n" if self.context.signal == "do":
+            case "n" if context.signal_length == 2:
                 self._accept(event)
-            case "'" if self.context.signal == "don":
+            case "'" if context.signal_length == 3:
                 self._accept(event)
-            case "t" if self.context.signal == "don'":
+            case "t" if context.signal_length == 4:
                 self._accept(event)
-            case "(" if self.context.signal == "don't":
+            case "(" if context.signal_length == 5:
                 self._accept(event)
-            case ")" if self.context.signal == "don't(":
-                self.context.signal = ""
-                self.context.set_state(DontState())
+            case ")" if context.signal_length == 6:
+                context.signal_length = 0
+                context.enter_state(DontState)
             case _:
                 self._reject()
 
@@ -160,15 +1077,25 @@ class DontState(AbstractState):
 
     def process_event(self, event: str) -> None:
         # Only way out of DontState is to find "do()" signal
+        context = self.context
         match event:
-            case "d" if self.context.signal == "":
+            case "d" if context.signal_length == 0:
                 self._accept(event)
-            case "o" if self.context.signal == "d":
+            case "o" if context.signal_length == 1:
                 self._accept(event)
-            case "(" if self.context.signal == "do":
+            case "(" if context.signal_length == 2:
                 self._accept(event)
-            case ")" if self.context.signal == "do(":
-                self.context.signal = ""
-                self.context.set_state(DoState())
+            case ")" if context.signal_length == 3:
+                context.signal_length = 0
+                context.enter_state(DoState)
             case _:
                 self._reject()
+
+
+# Class-based state for each DFA state ID
+_DFA_STATE_TYPES: list[type[AbstractState]] = (
+    [DoState] * (DFA_MUL_M - DFA_DO)
+    + [MulState] * (DFA_NUM_OPEN - DFA_MUL_M)
+    + [NumState, NumState, MulState, NumState]
+    + [DontState] * (DFA_NUM_STATES - DFA_DONT)
+)
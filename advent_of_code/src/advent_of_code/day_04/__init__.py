@@ -1,3 +1,3 @@
-from .utils import Puzzle
+from .utils import Puzzle, WordAutomaton, WordMatch, stencil_symmetries
 
-__all__ = ["Puzzle"]
+__all__ = ["Puzzle", "WordAutomaton", "WordMatch", "stencil_symmetries"]
@@ -1,5 +1,6 @@
 import pandas
 import typer
+from enum import Enum
 from pathlib import Path
 from typing_extensions import Annotated
 from .utils import Puzzle
@@ -7,18 +8,58 @@ from .utils import Puzzle
 app = typer.Typer(help="Day 4: Ceres Search")
 
 
+class PuzzleBackend(str, Enum):
+    pandas = "pandas"
+    numpy = "numpy"
+
+
+BackendOption = Annotated[
+    PuzzleBackend,
+    typer.Option(
+        "--backend",
+        help="Puzzle storage. 'numpy' stores one byte per cell and supports --memmap.",
+    ),
+]
+MemmapOption = Annotated[
+    bool,
+    typer.Option(
+        "--memmap", help="Memory-map the puzzle file. Requires the numpy backend.", is_flag=True
+    ),
+]
+
+
+def load_puzzle(data_file: str, backend: PuzzleBackend, memmap: bool) -> Puzzle:
+    """Load a puzzle with the selected backend.
+
+    Args:
+        data_file (str): Path to a fixed-width file with an input puzzle.
+        backend (PuzzleBackend): Puzzle storage.
+        memmap (bool): If True, memory-map the puzzle file.
+
+    Returns:
+        Puzzle: The loaded puzzle.
+    """
+    if memmap and backend != PuzzleBackend.numpy:
+        typer.echo("Error: --memmap requires the numpy backend.")
+        raise typer.Exit(code=1)
+    try:
+        return Puzzle(Path(data_file), backend=backend.value, memmap=memmap)
+    except ValueError as e:
+        typer.echo(f"Error: {e}")
+        raise typer.Exit(code=1)
+
+
 @app.command()
 def run_part1(
     data_file: Annotated[
         str, typer.Argument(..., help="Path to a fixed-width file with an input puzzle.")
     ],
+    backend: BackendOption = PuzzleBackend.numpy,
+    memmap: MemmapOption = False,
 ):
     """Count number of "XMAS" occurrences."""
-    puzzle = Puzzle(Path(data_file))
-    row_indices, col_indices = puzzle.char_search("X")
-    count = sum(
-        puzzle.get_word_count("XMAS", row, col) for row, col in zip(row_indices, col_indices)
-    )
+    puzzle = load_puzzle(data_file, backend, memmap)
+    count = puzzle.count_word("XMAS")
     typer.echo(f"Number of 'XMAS' occurrences: {count}")
 
 
@@ -27,8 +68,56 @@ def run_part2(
     data_file: Annotated[
         str, typer.Argument(..., help="Path to a fixed-width file with an input puzzle.")
     ],
+    backend: BackendOption = PuzzleBackend.numpy,
+    memmap: MemmapOption = False,
 ):
     """Count number of X-shaped 'MAS' occurrences."""
-    puzzle = Puzzle(Path(data_file))
+    puzzle = load_puzzle(data_file, backend, memmap)
     count = puzzle.get_x_mas_count()
     typer.echo(f"Number of X-shaped 'MAS' occurrences: {count}")
+
+
+@app.command()
+def run_word_search(
+    data_file: Annotated[
+        str, typer.Argument(..., help="Path to a fixed-width file with an input puzzle.")
+    ],
+    words: Annotated[
+        list[str] | None, typer.Argument(help="Words to search for.", show_default=False)
+    ] = None,
+    words_file: Annotated[
+        str | None,
+        typer.Option("--words-file", help="Path to a file with one word to search for per line."),
+    ] = None,
+    positions: Annotated[
+        bool,
+        typer.Option(
+            "--positions",
+            help="Print the start row, column and direction of every occurrence.",
+            is_flag=True,
+        ),
+    ] = False,
+    backend: BackendOption = PuzzleBackend.numpy,
+    memmap: MemmapOption = False,
+):
+    """Count occurrences of many words in all 8 directions with a single pass over the puzzle."""
+    words = list(words or [])
+    if words_file is not None:
+        try:
+            with open(words_file, "r") as f:
+                words.extend(line.strip() for line in f if line.strip())
+        except FileNotFoundError:
+            typer.echo(f"Error: The file '{words_file}' was not found.")
+            raise typer.Exit(code=1)
+    if not words:
+        typer.echo("Error: At least one word must be provided.")
+        raise typer.Exit(code=1)
+    puzzle = load_puzzle(data_file, backend, memmap)
+    if not positions:
+        for word, count in puzzle.count_words(words).items():
+            typer.echo(f"{word}: {count}")
+        return
+    for word, matches in puzzle.find_words(words).items():
+        typer.echo(f"{word}: {len(matches)}")
+        for row, col, row_step, col_step in matches:
+            typer.echo(f"\t({row}, {col}) step ({row_step}, {col_step})")
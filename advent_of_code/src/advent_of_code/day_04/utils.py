@@ -1,7 +1,116 @@
 import numpy
 import pandas
 from numpy.typing import NDArray
+from collections.abc import Callable, Iterable, Iterator, Sequence
 from pathlib import Path
+from typing import NamedTuple
+
+PUZZLE_BACKENDS = ("pandas", "numpy")
+
+# Row and column steps of the eight search directions, in the order used by `get_word_count`
+DIRECTIONS = [(-1, 0), (-1, 1), (0, 1), (1, 1), (1, 0), (1, -1), (0, -1), (-1, -1)]
+
+# Two "MAS" crossing on their 'A', with '.' matching any character
+X_MAS_STENCIL = ("M.S", ".A.", "M.S")
+
+
+def stencil_symmetries(
+    stencil: Sequence[str], reflections: bool = True, wildcard: str = "."
+) -> list[tuple[str, ...]]:
+    """List the distinct rotations and, optionally, reflections of a stencil.
+
+    Args:
+        stencil (Sequence[str]): Rows of the pattern. Short rows are padded with `wildcard`.
+        reflections (bool): If True, include mirror images.
+        wildcard (str): Character matching any puzzle value.
+
+    Returns:
+        list[tuple[str, ...]]: The distinct variants, starting with `stencil` itself.
+    """
+    width = max((len(row) for row in stencil), default=0)
+    grid = [list(row.ljust(width, wildcard)) for row in stencil]
+    candidates = []
+    for _ in range(4):
+        candidates.append(grid)
+        if reflections:
+            candidates.append([row[::-1] for row in grid])
+        grid = [list(row) for row in zip(*grid[::-1])]  # rotate clockwise
+    variants: list[tuple[str, ...]] = []
+    for candidate in candidates:
+        variant = tuple("".join(row) for row in candidate)
+        if variant not in variants:
+            variants.append(variant)
+    return variants
+
+
+class WordMatch(NamedTuple):
+    """An occurrence of a word in the puzzle.
+
+    Attributes:
+        row (int): Row index of the first letter.
+        col (int): Column index of the first letter.
+        row_step (int): Row increment per letter.
+        col_step (int): Column increment per letter.
+    """
+
+    row: int
+    col: int
+    row_step: int
+    col_step: int
+
+
+class WordAutomaton:
+    """Aho-Corasick automaton for finding many words in one pass over a text.
+
+    Attributes:
+        words (list[str]): The distinct non-empty words searched for.
+        _goto (list[dict[str, int]]): Trie transitions of each state.
+        _fail (list[int]): State of the longest proper suffix of each state that is in the trie.
+        _output (list[list[int]]): Indices of the words that end in each state.
+    """
+
+    def __init__(self, words: Iterable[str]):
+        self.words: list[str] = list(dict.fromkeys(word for word in words if word))
+        self._goto: list[dict[str, int]] = [{}]
+        self._output: list[list[int]] = [[]]
+        for index, word in enumerate(self.words):
+            state = 0
+            for char in word:
+                if char not in self._goto[state]:
+                    self._goto.append({})
+                    self._output.append([])
+                    self._goto[state][char] = len(self._goto) - 1
+                state = self._goto[state][char]
+            self._output[state].append(index)
+        # Breadth-first, so that failure states are complete before their children are visited
+        self._fail: list[int] = [0] * len(self._goto)
+        queue = list(self._goto[0].values())
+        for state in queue:
+            for char, child in self._goto[state].items():
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[child] = self._goto[fail].get(char, 0)
+                self._output[child] = self._output[child] + self._output[self._fail[child]]
+                queue.append(child)
+
+    def iter_matches(self, text: str) -> Iterator[tuple[int, int]]:
+        """Find every occurrence of every word in a text, including overlapping ones.
+
+        Args:
+            text (str): The text to search.
+
+        Yields:
+            tuple[int, int]: Index of the word in `words` and start index of the occurrence.
+        """
+        goto, fail, output, words = self._goto, self._fail, self._output, self.words
+        state = 0
+        for end, char in enumerate(text, start=1):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for index in output[state]:
+                yield index, end - len(words[index])
 
 
 class Puzzle:
@@ -9,10 +118,19 @@ class Puzzle:
 
     Holds the word search character matrix and provides methods for
     interacting with the puzzle.
+
+    The matrix is either a DataFrame of characters ('pandas' backend) or a 2-D array of ASCII
+    codes ('numpy' backend), which takes one byte per cell and can be memory-mapped.
     """
 
-    def __init__(self, puzzle_file: Path):
-        self.puzzle: pandas.DataFrame = self._load_puzzle(puzzle_file)
+    def __init__(self, puzzle_file: Path, backend: str = "pandas", memmap: bool = False):
+        if backend not in PUZZLE_BACKENDS:
+            raise ValueError(f"'backend' must be one of {PUZZLE_BACKENDS}.")
+        self.puzzle: pandas.DataFrame | NDArray[numpy.uint8]
+        if backend == "numpy":
+            self.puzzle = self._load_grid(puzzle_file, memmap)
+        else:
+            self.puzzle = self._load_puzzle(puzzle_file)
 
     def _load_puzzle(self, puzzle_file: Path) -> pandas.DataFrame:
         """Load the puzzle from a file into a DataFrame.
@@ -28,6 +146,73 @@ class Puzzle:
         data = [list(line.strip()) for line in lines]
         return pandas.DataFrame(data, dtype=str)
 
+    def _load_grid(self, puzzle_file: Path, memmap: bool = False) -> NDArray[numpy.uint8]:
+        """Load the puzzle from a fixed-width file into a 2-D array of ASCII codes.
+
+        Rows are read as a strided view over the raw file bytes that skips the line endings, so
+        no per-character objects are created.
+
+        Args:
+            puzzle_file (Path): The path to the puzzle file.
+            memmap (bool): If True, memory-map the file instead of reading it into memory.
+
+        Returns:
+            NDArray[numpy.uint8]: The loaded puzzle with one row per line.
+        """
+        if memmap and Path(puzzle_file).stat().st_size > 0:
+            raw = numpy.memmap(puzzle_file, dtype=numpy.uint8, mode="r")
+        else:
+            raw = numpy.fromfile(puzzle_file, dtype=numpy.uint8)
+        newlines = numpy.flatnonzero(raw == ord("\n"))
+        if raw.size == 0 or newlines.size == 0:
+            return numpy.array(raw, dtype=numpy.uint8).reshape(1 if raw.size else 0, raw.size)
+        width = int(newlines[0])
+        ending = 1
+        if width > 0 and raw[width - 1] == ord("\r"):
+            width -= 1
+            ending = 2
+        stride = width + ending
+        # The last line may have no line ending
+        n_rows = (raw.size + ending) // stride
+        line_ends = numpy.arange(stride - 1, raw.size, stride)
+        if raw.size not in (n_rows * stride, n_rows * stride - ending) or not numpy.array_equal(
+            newlines, line_ends
+        ):
+            raise ValueError("All puzzle rows must have the same width.")
+        return numpy.lib.stride_tricks.as_strided(
+            raw, shape=(n_rows, width), strides=(stride, 1), writeable=False
+        )
+
+    def _read_cells(
+        self, row_index: int, col_index: int, row_step: int, col_step: int, length: int
+    ) -> str:
+        """Read puzzle values along a direction from a grid loaded with the 'numpy' backend.
+
+        Args:
+            row_index (int): The starting row index.
+            col_index (int): The starting col_index.
+            row_step (int): Row increment per value.
+            col_step (int): Column increment per value.
+            length (int): The number of values to retrieve.
+
+        Returns:
+            The puzzle values as a string.
+        """
+        steps = numpy.arange(length)
+        cells = self.puzzle[row_index + row_step * steps, col_index + col_step * steps]
+        return cells.tobytes().decode("ascii")
+
+    def _get_codes(self) -> NDArray[numpy.integer]:
+        """Get the puzzle as a 2-D array of character code points.
+
+        Returns:
+            NDArray[numpy.integer]: The grid itself for the 'numpy' backend, otherwise a copy of
+                the DataFrame as 'uint32' code points.
+        """
+        if isinstance(self.puzzle, numpy.ndarray):
+            return self.puzzle
+        return self.puzzle.to_numpy(dtype="U1").view(numpy.uint32)
+
     def char_search(self, char: str) -> tuple[NDArray[numpy.int_], NDArray[numpy.int_]]:
         """Find all instances of a character in the puzzle.
 
@@ -39,7 +224,12 @@ class Puzzle:
         """
         if len(char) > 1:
             raise ValueError("'char' must be length 1.")
-        rows, cols = numpy.where(self.puzzle == char)
+        if not char:
+            rows, cols = numpy.nonzero(numpy.zeros(self.puzzle.shape, dtype=bool))
+        elif isinstance(self.puzzle, numpy.ndarray):
+            rows, cols = numpy.nonzero(self.puzzle == ord(char))
+        else:
+            rows, cols = numpy.where(self.puzzle == char)
         return rows, cols
 
     def _get_north(self, row_index: int, col_index: int, length: int) -> str:
@@ -63,6 +253,8 @@ class Puzzle:
             return ""
         if row_index - length + 1 < 0:
             return ""
+        if isinstance(self.puzzle, numpy.ndarray):
+            return self._read_cells(row_index, col_index, -1, 0, length)
         return self.puzzle.iloc[row_index - length + 1 : row_index + 1, col_index][::-1].str.cat(
             sep=""
         )
@@ -88,6 +280,8 @@ class Puzzle:
             return ""
         if row_index + length > self.puzzle.shape[0]:
             return ""
+        if isinstance(self.puzzle, numpy.ndarray):
+            return self._read_cells(row_index, col_index, 1, 0, length)
         return self.puzzle.iloc[row_index : row_index + length, col_index].str.cat(sep="")
 
     def _get_east(self, row_index: int, col_index: int, length: int) -> str:
@@ -111,6 +305,8 @@ class Puzzle:
             return ""
         if col_index + length > self.puzzle.shape[1]:
             return ""
+        if isinstance(self.puzzle, numpy.ndarray):
+            return self._read_cells(row_index, col_index, 0, 1, length)
         return self.puzzle.iloc[row_index, col_index : col_index + length].str.cat(sep="")
 
     def _get_west(self, row_index: int, col_index: int, length: int) -> str:
@@ -134,6 +330,8 @@ class Puzzle:
             return ""
         if col_index - length + 1 < 0:
             return ""
+        if isinstance(self.puzzle, numpy.ndarray):
+            return self._read_cells(row_index, col_index, 0, -1, length)
         return self.puzzle.iloc[row_index, col_index - length + 1 : col_index + 1][::-1].str.cat(
             sep=""
         )
@@ -159,6 +357,8 @@ class Puzzle:
             return ""
         if row_index - length + 1 < 0 or col_index + length > self.puzzle.shape[1]:
             return ""
+        if isinstance(self.puzzle, numpy.ndarray):
+            return self._read_cells(row_index, col_index, -1, 1, length)
         row_indices = [row_index - i for i in range(length)]
         col_indices = [col_index + i for i in range(length)]
         char_list = [str(self.puzzle.iloc[row, col]) for row, col in zip(row_indices, col_indices)]
@@ -185,6 +385,8 @@ class Puzzle:
             return ""
         if row_index - length + 1 < 0 or col_index - length + 1 < 0:
             return ""
+        if isinstance(self.puzzle, numpy.ndarray):
+            return self._read_cells(row_index, col_index, -1, -1, length)
         row_indices = [row_index - i for i in range(length)]
         col_indices = [col_index - i for i in range(length)]
         char_list = [str(self.puzzle.iloc[row, col]) for row, col in zip(row_indices, col_indices)]
@@ -211,6 +413,8 @@ class Puzzle:
             return ""
         if row_index + length > self.puzzle.shape[0] or col_index + length > self.puzzle.shape[1]:
             return ""
+        if isinstance(self.puzzle, numpy.ndarray):
+            return self._read_cells(row_index, col_index, 1, 1, length)
         row_indices = [row_index + i for i in range(length)]
         col_indices = [col_index + i for i in range(length)]
         char_list = [str(self.puzzle.iloc[row, col]) for row, col in zip(row_indices, col_indices)]
@@ -239,6 +443,8 @@ class Puzzle:
             return ""
         if row_index + length > self.puzzle.shape[0] or col_index - length + 1 < 0:
             return ""
+        if isinstance(self.puzzle, numpy.ndarray):
+            return self._read_cells(row_index, col_index, 1, -1, length)
         row_indices = [row_index + i for i in range(length)]
         col_indices = [col_index - i for i in range(length)]
         char_list = [str(self.puzzle.iloc[row, col]) for row, col in zip(row_indices, col_indices)]
@@ -273,28 +479,176 @@ class Puzzle:
                 total += 1
         return total
 
+    def count_word(self, word: str) -> int:
+        """Tally how often a word exists in the puzzle in any direction from any position.
+
+        Equivalent to summing `get_word_count` over every position. For each direction, the
+        positions where the word fits are compared against each letter at once with shifted
+        slices of the whole grid, so the cost is 8 * len(word) array operations.
+
+        Args:
+            word (str): The word to search for.
+
+        Returns:
+            int: The count of occurrences of the word.
+        """
+        if not word:
+            return 0
+        codes = self._get_codes()
+        n_rows, n_cols = codes.shape
+        span = len(word) - 1
+        total = 0
+        for row_step, col_step in DIRECTIONS:
+            # Range of start positions for which the whole word stays inside the puzzle
+            row_start, row_stop = max(0, -row_step * span), n_rows - max(0, row_step * span)
+            col_start, col_stop = max(0, -col_step * span), n_cols - max(0, col_step * span)
+            if row_stop <= row_start or col_stop <= col_start:
+                continue
+            mask = numpy.ones((row_stop - row_start, col_stop - col_start), dtype=bool)
+            for i, char in enumerate(word):
+                rows = slice(row_start + row_step * i, row_stop + row_step * i)
+                cols = slice(col_start + col_step * i, col_stop + col_step * i)
+                mask &= codes[rows, cols] == ord(char)
+            total += int(numpy.count_nonzero(mask))
+        return total
+
+    def _iter_lines(self) -> Iterator[tuple[str, int, int, int, int]]:
+        """Extract every row, column, diagonal and anti-diagonal of the puzzle in both directions.
+
+        Yields:
+            tuple[str, int, int, int, int]: The line as a string, the row and column of its first
+                character, and the row and column increments along it.
+        """
+        codes = self._get_codes()
+        n_rows, n_cols = codes.shape
+        flipped = codes[:, ::-1]
+        lines = []
+        for row in range(n_rows):
+            lines.append((codes[row, :], row, 0, 0, 1))
+        for col in range(n_cols):
+            lines.append((codes[:, col], 0, col, 1, 0))
+        for offset in range(1 - n_rows, n_cols):
+            start_row, start_col = max(0, -offset), max(0, offset)
+            lines.append((codes.diagonal(offset), start_row, start_col, 1, 1))
+            lines.append((flipped.diagonal(offset), start_row, n_cols - 1 - start_col, 1, -1))
+        for values, row, col, row_step, col_step in lines:
+            text = numpy.ascontiguousarray(values, dtype="<u4").tobytes().decode("utf-32-le")
+            yield text, row, col, row_step, col_step
+            end = len(text) - 1
+            yield text[::-1], row + row_step * end, col + col_step * end, -row_step, -col_step
+
+    def _scan_words(self, words: Iterable[str], on_match: Callable[[str, WordMatch], None]) -> None:
+        """Run one Aho-Corasick automaton over every line of the puzzle in both directions.
+
+        Args:
+            words (Iterable[str]): The words to search for.
+            on_match (Callable[[str, WordMatch], None]): Called with each word and occurrence.
+        """
+        automaton = WordAutomaton(words)
+        if not automaton.words:
+            return
+        words = automaton.words
+        for text, row, col, row_step, col_step in self._iter_lines():
+            for index, start in automaton.iter_matches(text):
+                match = WordMatch(
+                    row + row_step * start, col + col_step * start, row_step, col_step
+                )
+                on_match(words[index], match)
+
+    def count_words(self, words: Iterable[str]) -> dict[str, int]:
+        """Tally how often each of many words exists in the puzzle in any direction.
+
+        Every line of the puzzle is extracted once and all words are matched in a single pass
+        over it, so the cost is linear in the grid size plus the number of matches. Each count
+        equals `count_word` for that word.
+
+        Args:
+            words (Iterable[str]): The words to search for.
+
+        Returns:
+            dict[str, int]: The count of occurrences of each distinct word.
+        """
+        words = list(words)
+        counts = dict.fromkeys(words, 0)
+
+        def add_match(word: str, match: WordMatch) -> None:
+            counts[word] += 1
+
+        self._scan_words(words, add_match)
+        return counts
+
+    def find_words(self, words: Iterable[str]) -> dict[str, list[WordMatch]]:
+        """Locate every occurrence of each of many words in the puzzle in any direction.
+
+        Args:
+            words (Iterable[str]): The words to search for.
+
+        Returns:
+            dict[str, list[WordMatch]]: The occurrences of each distinct word.
+        """
+        words = list(words)
+        matches: dict[str, list[WordMatch]] = {word: [] for word in words}
+        self._scan_words(words, lambda word, match: matches[word].append(match))
+        return matches
+
+    def match_stencil(self, stencil: Sequence[str], wildcard: str = ".") -> NDArray[numpy.bool_]:
+        """Find the positions where a 2-D pattern matches the puzzle.
+
+        Each non-wildcard cell of the stencil is compared against a shifted slice of the whole
+        grid, and the comparisons are combined with AND.
+
+        Args:
+            stencil (Sequence[str]): Rows of the pattern. Short rows are padded with `wildcard`.
+            wildcard (str): Character matching any puzzle value.
+
+        Returns:
+            NDArray[numpy.bool_]: Mask with the shape of the puzzle that is True where the
+                top-left corner of a match lies.
+        """
+        cells = [
+            (row, col, ord(char))
+            for row, line in enumerate(stencil)
+            for col, char in enumerate(line)
+            if char != wildcard
+        ]
+        if not cells:
+            raise ValueError("'stencil' must contain at least one non-wildcard character.")
+        codes = self._get_codes()
+        n_rows, n_cols = codes.shape
+        height = len(stencil)
+        width = max(len(line) for line in stencil)
+        mask = numpy.zeros((n_rows, n_cols), dtype=bool)
+        if height > n_rows or width > n_cols:
+            return mask
+        n_row_starts, n_col_starts = n_rows - height + 1, n_cols - width + 1
+        matches = numpy.ones((n_row_starts, n_col_starts), dtype=bool)
+        for row, col, code in cells:
+            matches &= codes[row : row + n_row_starts, col : col + n_col_starts] == code
+        mask[:n_row_starts, :n_col_starts] = matches
+        return mask
+
+    def count_stencils(self, stencils: Sequence[Sequence[str]], wildcard: str = ".") -> int:
+        """Count the matches of several 2-D patterns in the puzzle.
+
+        The matches of each stencil are counted separately, so a position matched by two
+        stencils counts twice. This counts every occurrence of a motif given in all of its
+        distinct orientations, as from `stencil_symmetries`, exactly once.
+
+        Args:
+            stencils (Sequence[Sequence[str]]): The patterns, each given as rows.
+            wildcard (str): Character matching any puzzle value.
+
+        Returns:
+            int: The total number of matches.
+        """
+        return sum(
+            int(numpy.count_nonzero(self.match_stencil(stencil, wildcard))) for stencil in stencils
+        )
+
     def get_x_mas_count(self) -> int:
         """Count the total occurrences of X-shaped "MAS" patterns in the puzzle.
 
         Returns:
             int: The total count of X-shaped "MAS" occurrences.
         """
-        row_indices, col_indices = self.char_search("A")
-        # Prune indices that cannot form an X shape (on the edges)
-        valid_indices = [
-            (row, col)
-            for row, col in zip(row_indices, col_indices)
-            if 0 < row < self.puzzle.shape[0] - 1 and 0 < col < self.puzzle.shape[1] - 1
-        ]
-        total = 0
-        for row, col in valid_indices:
-            # Look for only X's (not crosses)
-            if (
-                self._get_northeast(row + 1, col - 1, 3) == "MAS"
-                or self._get_southwest(row - 1, col + 1, 3) == "MAS"
-            ) and (
-                self._get_northwest(row + 1, col + 1, 3) == "MAS"
-                or self._get_southeast(row - 1, col - 1, 3) == "MAS"
-            ):
-                total += 1
-        return total
+        return self.count_stencils(stencil_symmetries(X_MAS_STENCIL))
@@ -1,6 +1,17 @@
+import numpy
 import pandas
 import pytest
-from advent_of_code.day_01.utils import get_manhattan_dist, get_similarity_score
+import typer
+from advent_of_code.day_01.utils import (
+    IncrementalPairTracker,
+    get_manhattan_dist,
+    get_manhattan_dist_counting,
+    get_manhattan_dist_external,
+    get_similarity_score,
+    get_similarity_score_vectorized,
+    is_dense_range,
+    load_data_chunked,
+)
 
 
 @pytest.fixture
@@ -26,8 +37,146 @@ def test_get_similarity_score(sample_data, invalid_data):
         get_similarity_score(*invalid_data)
 
 
+def test_get_similarity_score_vectorized(sample_data, invalid_data):
+    expected_score = 31
+    assert get_similarity_score_vectorized(*sample_data) == expected_score
+    with pytest.raises(ValueError):
+        get_similarity_score_vectorized(*invalid_data)
+
+    # Match the reference implementation on random data with partial overlap
+    rng = numpy.random.default_rng(0)
+    series1 = pandas.Series(rng.integers(0, 50, size=1000))
+    series2 = pandas.Series(rng.integers(25, 75, size=1000))
+    assert get_similarity_score_vectorized(series1, series2) == get_similarity_score(
+        series1, series2
+    )
+    assert (
+        get_similarity_score_vectorized(pandas.Series([], dtype=int), pandas.Series([], dtype=int))
+        == 0
+    )
+
+    # Repeated large IDs whose score does not fit in int64
+    series = pandas.Series([10**9] * 200_000)
+    assert get_similarity_score_vectorized(series, series) == 40_000_000_000_000_000_000
+    assert get_similarity_score_vectorized(series, series) == get_similarity_score(series, series)
+
+
 def test_get_manhattan_dist(sample_data, invalid_data):
     expected_distance = 11
     assert get_manhattan_dist(*sample_data) == expected_distance
     with pytest.raises(ValueError):
         get_manhattan_dist(*invalid_data)
+
+
+@pytest.fixture
+def pair_file(tmp_path):
+    file_path = tmp_path / "pairs.tsv"
+    file_path.write_text("3\t4\n4\t3\n2\t5\n\n1\t3\n3\t9\n3\t3")  # blank line, no final newline
+    return str(file_path)
+
+
+def test_load_data_chunked(pair_file, tmp_path):
+    for memmap_dir in [None, str(tmp_path)]:
+        array1, array2 = load_data_chunked(pair_file, chunk_size=2, memmap_dir=memmap_dir)
+        assert array1.dtype == numpy.int64
+        assert array2.dtype == numpy.int64
+        assert array1.tolist() == [3, 4, 2, 1, 3, 3]
+        assert array2.tolist() == [4, 3, 5, 3, 9, 3]
+        array1.sort()
+        array2.sort()
+        assert get_manhattan_dist(array1, array2) == 11
+        assert get_similarity_score(array1, array2) == 31
+
+    bad_file = tmp_path / "three_columns.tsv"
+    bad_file.write_text("1\t2\t3\n4\t5\t6\n")
+    with pytest.raises(typer.Exit):
+        load_data_chunked(str(bad_file))
+    with pytest.raises(ValueError):
+        load_data_chunked(pair_file, chunk_size=0)
+
+
+def test_get_manhattan_dist_external(pair_file, tmp_path):
+    run_dir = tmp_path / "runs"
+    run_dir.mkdir()
+    for run_size in [1, 2, 4, 100]:
+        for block_size in [1, 2, 100]:
+            distance = get_manhattan_dist_external(
+                pair_file, run_size=run_size, block_size=block_size, tmp_dir=str(run_dir)
+            )
+            assert distance == 11
+    assert list(run_dir.iterdir()) == []  # run files are cleaned up
+
+    # Match the in-memory result on random data spanning many runs
+    rng = numpy.random.default_rng(0)
+    data = rng.integers(10000, 99999, size=(5000, 2))
+    random_file = tmp_path / "random.tsv"
+    numpy.savetxt(random_file, data, fmt="%d", delimiter="\t")
+    expected = get_manhattan_dist(numpy.sort(data[:, 0]), numpy.sort(data[:, 1]))
+    assert get_manhattan_dist_external(str(random_file), run_size=333, block_size=64) == expected
+
+    # Presorted input is streamed without spilling
+    sorted_file = tmp_path / "sorted.tsv"
+    numpy.savetxt(sorted_file, numpy.sort(data, axis=0), fmt="%d", delimiter="\t")
+    assert get_manhattan_dist_external(str(sorted_file), run_size=333, is_sorted=True) == expected
+
+    with pytest.raises(ValueError):
+        get_manhattan_dist_external(pair_file, run_size=0)
+
+
+def test_get_manhattan_dist_counting(sample_data, invalid_data):
+    # Counting path takes unsorted input
+    expected_distance = 11
+    series1, series2 = sample_data
+    assert get_manhattan_dist_counting(series1[::-1], series2[::-1]) == expected_distance
+    assert get_manhattan_dist_counting(series1, series2, value_range=(0, 10)) == expected_distance
+    with pytest.raises(ValueError):
+        get_manhattan_dist_counting(series1, series2, value_range=(2, 10))
+    with pytest.raises(ValueError):
+        get_manhattan_dist_counting(*invalid_data)
+
+    rng = numpy.random.default_rng(0)
+    array1 = rng.integers(10000, 99999, size=2000)
+    array2 = rng.integers(10000, 99999, size=2000)
+    expected = get_manhattan_dist(numpy.sort(array1), numpy.sort(array2))
+    assert get_manhattan_dist_counting(array1, array2) == expected
+
+
+def test_is_dense_range():
+    assert is_dense_range(numpy.array([1, 5, 3]), numpy.array([2, 2, 4]))
+    assert not is_dense_range(numpy.array([1, 500, 3]), numpy.array([2, 2, 4]))
+    assert not is_dense_range(numpy.array([1, 5, 3]), numpy.array([2, 2, 4]), max_range=2)
+    assert not is_dense_range(numpy.array([], dtype=int), numpy.array([], dtype=int))
+
+
+def test_incremental_pair_tracker(sample_data):
+    tracker = IncrementalPairTracker(value_range=(0, 10))
+    assert tracker.distance == 0
+    assert tracker.score == 0
+    tracker.extend(*sample_data)
+    assert tracker.size == 6
+    assert tracker.distance == 11
+    assert tracker.score == 31
+
+    with pytest.raises(ValueError):
+        tracker.add(11, 3)
+    with pytest.raises(ValueError):
+        tracker.remove(7, 3)
+    with pytest.raises(ValueError):
+        IncrementalPairTracker(value_range=(5, 0))
+
+    # Both metrics match a full recompute after every insert and delete
+    rng = numpy.random.default_rng(0)
+    tracker = IncrementalPairTracker(value_range=(0, 50))
+    pairs = rng.integers(0, 51, size=(300, 2)).tolist()
+    for i, (value1, value2) in enumerate(pairs):
+        tracker.add(value1, value2)
+        array1 = numpy.array([pair[0] for pair in pairs[: i + 1]])
+        array2 = numpy.array([pair[1] for pair in pairs[: i + 1]])
+        assert tracker.distance == get_manhattan_dist(numpy.sort(array1), numpy.sort(array2))
+        assert tracker.score == get_similarity_score(array1, array2)
+    for i, (value1, value2) in enumerate(pairs[:-1]):
+        tracker.remove(value1, value2)
+        array1 = numpy.array([pair[0] for pair in pairs[i + 1 :]])
+        array2 = numpy.array([pair[1] for pair in pairs[i + 1 :]])
+        assert tracker.distance == get_manhattan_dist(numpy.sort(array1), numpy.sort(array2))
+        assert tracker.score == get_similarity_score(array1, array2)
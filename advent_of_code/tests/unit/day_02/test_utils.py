@@ -1,11 +1,26 @@
 from advent_of_code.day_02.utils import (
+    ReportCheck,
+    Reports,
+    count_safe_reports_parallel,
+    evaluate_report,
     get_diff,
+    get_min_removal_counts,
+    get_min_removals,
+    get_safe_mask,
     load_data,
+    load_reports,
     get_series_combinations,
     get_change_violation_count,
     get_monotonicity_violation_count,
+    is_safe_brute_force,
+    is_safe_report,
+    is_safe_with_dampener,
+    is_safe_with_removals,
+    iter_reports,
+    iter_series_combinations,
 )
 import itertools
+import numpy
 import pandas
 import pathlib
 import pytest
@@ -57,6 +72,66 @@ def test_load_data(file_paths):
         load_data(file_paths[4])
 
 
+def test_load_reports(file_paths):
+    reports = load_reports(file_paths[0])
+    assert isinstance(reports, Reports)
+    assert len(reports) == 6
+    assert reports.values.dtype == numpy.int64
+    assert reports.lengths.tolist() == [5] * 6
+    assert reports[0].tolist() == [7, 6, 4, 2, 1]
+    assert reports[-1].tolist() == [1, 3, 6, 7, 9]
+    assert [report.tolist() for report in reports] == [
+        series.tolist() for series in load_data(file_paths[0])
+    ]
+
+    with pytest.raises(typer.Exit):
+        load_reports(file_paths[1])
+    with pytest.raises(typer.Exit):
+        load_reports(file_paths[2])
+    with pytest.raises(typer.Exit):
+        load_reports(file_paths[3])
+    with pytest.raises(FileNotFoundError):
+        load_reports(file_paths[4])
+
+
+def test_iter_reports(file_paths):
+    reports = iter_reports(file_paths[0])
+    assert next(reports) == [7, 6, 4, 2, 1]
+    assert [report for report in reports] == [
+        [1, 2, 7, 8, 9],
+        [9, 7, 6, 2, 1],
+        [1, 3, 2, 4, 5],
+        [8, 6, 4, 4, 1],
+        [1, 3, 6, 7, 9],
+    ]
+    with pytest.raises(typer.Exit):
+        list(iter_reports(file_paths[1]))
+    # Lines before an invalid one are yielded before the error is raised
+    reports = iter_reports(file_paths[2])
+    assert next(reports) == [7, 6, 4, 2, 1]
+    with pytest.raises(typer.Exit):
+        list(reports)
+    with pytest.raises(typer.Exit):
+        list(iter_reports(file_paths[3]))
+    with pytest.raises(FileNotFoundError):
+        list(iter_reports(file_paths[4]))
+
+
+def test_reports():
+    reports = Reports.from_lists([[1, 2, 3], [], [4], [5, 6]])
+    assert len(reports) == 4
+    assert reports.offsets.tolist() == [0, 3, 3, 4, 6]
+    assert reports[1].size == 0
+    assert reports[3].tolist() == [5, 6]
+    assert reports.nbytes == reports.values.nbytes + reports.offsets.nbytes
+    with pytest.raises(IndexError):
+        reports[4]
+    with pytest.raises(ValueError):
+        Reports(numpy.arange(3), numpy.array([0, 2]))
+    with pytest.raises(ValueError):
+        Reports(numpy.arange(3), numpy.array([0, 2, 1, 3]))
+
+
 def test_get_series_combinations(example_data):
     for _, row in example_data.iterrows():
         n = len(row)
@@ -74,6 +149,31 @@ def test_get_series_combinations(example_data):
         get_series_combinations(example_data.iloc[0], len(example_data.iloc[0]) + 1)
 
 
+def test_iter_series_combinations(example_data):
+    for _, row in example_data.iterrows():
+        n = len(row)
+        for r in range(1, n + 1):
+            combinations = iter_series_combinations(row, r)
+            assert not isinstance(combinations, (list, pandas.DataFrame))
+            assert list(combinations) == list(itertools.combinations(row.tolist(), r))
+    row = numpy.array([1, 2, 3, 4])
+    assert list(iter_series_combinations(row, 2, predicate=lambda x: sum(x) == 5)) == [
+        (1, 4),
+        (2, 3),
+    ]
+
+    # Generation stops with the consumer
+    checked = []
+    combinations = iter_series_combinations(row, 3, predicate=lambda x: checked.append(x) or True)
+    assert next(combinations) == (1, 2, 3)
+    assert checked == [(1, 2, 3)]
+
+    with pytest.raises(ValueError):
+        list(iter_series_combinations(row, 0))
+    with pytest.raises(ValueError):
+        list(iter_series_combinations(row, 5))
+
+
 def test_get_diff(example_data):
     for _, row in example_data.iterrows():
         expected_row_diff = pandas.Series(dtype=int)
@@ -120,3 +220,180 @@ def test_get_change_violation_count():
     ]
     for series, expected_count in test_cases:
         assert get_change_violation_count(series, min_change=1, max_change=3) == expected_count
+
+
+def test_violation_counts_on_reports():
+    series_list = [
+        [1, 2, 3, 5],
+        [1, 3, 2, 4, 5],
+        [1, 2, 3, 2, 1],
+        [1, 5, 4, 13, 2],
+        [1, 1, 3, 3],
+        [4, 3, 3, 2, 1],
+        [1],
+        [],
+        [3, 3, 3],
+        [2, 2, 5, 1],
+    ]
+    reports = Reports.from_lists(series_list)
+    expected_monotonicity = [
+        get_monotonicity_violation_count(pandas.Series(x)) for x in series_list
+    ]
+    expected_change = [get_change_violation_count(pandas.Series(x)) for x in series_list]
+    assert get_monotonicity_violation_count(reports).tolist() == expected_monotonicity
+    assert get_change_violation_count(reports).tolist() == expected_change
+    for report, monotonicity, change in zip(reports, expected_monotonicity, expected_change):
+        assert get_monotonicity_violation_count(report) == monotonicity
+        assert get_change_violation_count(report) == change
+    assert get_monotonicity_violation_count(Reports.from_lists([[], [1]])).tolist() == [0, 0]
+
+
+def test_is_safe_with_dampener(example_data):
+    expected = [True, False, False, True, True, True]
+    for (_, row), is_safe in zip(example_data.iterrows(), expected):
+        assert is_safe_with_dampener(row) is is_safe
+        assert is_safe_brute_force(row) is is_safe
+
+    test_cases = [
+        (numpy.array([5, 1, 2, 3]), True),  # Remove first level
+        (numpy.array([1, 2, 3, 9]), True),  # Remove last level
+        (numpy.array([3, 1, 2, 3, 4]), True),  # Removal flips the direction
+        (numpy.array([1, 9]), True),  # Single remaining level is safe
+        (numpy.array([1, 1, 1]), False),
+        (numpy.array([1, 5, 9, 13]), False),
+    ]
+    for series, is_safe in test_cases:
+        assert is_safe_with_dampener(series) is is_safe
+
+    # Match the brute force reference on random reports
+    rng = numpy.random.default_rng(0)
+    for _ in range(100):
+        series = numpy.cumsum(rng.integers(-4, 5, size=rng.integers(2, 9)))
+        for min_change, max_change in [(1, 3), (0, 2), (2, 5)]:
+            assert is_safe_with_dampener(series, min_change, max_change) == is_safe_brute_force(
+                series, min_change, max_change
+            )
+    with pytest.raises(ValueError):
+        is_safe_with_dampener(numpy.array([1, 2]), min_change=3, max_change=1)
+
+
+def test_get_safe_mask(file_paths):
+    reports = load_reports(file_paths[0])
+    assert get_safe_mask(reports).tolist() == [True, False, False, False, False, True]
+
+    # Match the per-report checks on random reports
+    rng = numpy.random.default_rng(0)
+    series_list = [
+        numpy.cumsum(rng.integers(-4, 5, size=rng.integers(0, 9))).tolist() for _ in range(500)
+    ]
+    reports = Reports.from_lists(series_list)
+    for min_change, max_change in [(1, 3), (0, 2), (2, 5)]:
+        expected = [
+            len(x) >= 2
+            and get_monotonicity_violation_count(numpy.array(x)) == 0
+            and get_change_violation_count(numpy.array(x), min_change, max_change) == 0
+            for x in series_list
+        ]
+        assert get_safe_mask(reports, min_change, max_change).tolist() == expected
+    with pytest.raises(ValueError):
+        get_safe_mask(reports, min_change=3, max_change=1)
+
+
+def test_evaluate_report():
+    test_cases = [
+        ([1, 2, 3, 5], ReportCheck(0, 0, -1)),
+        ([3, 2, 1], ReportCheck(0, 0, -1)),
+        ([1, 2, 2, 3, 4], ReportCheck(0, 1, 1)),
+        ([1, 3, 2, 4, 5], ReportCheck(1, 0, 1)),
+        ([1, 5, 4, 13, 2], ReportCheck(2, 3, 0)),
+        ([1, 1, 3, 3], ReportCheck(0, 2, 0)),
+        ([1], ReportCheck(0, 0, -1)),
+        ([], ReportCheck(0, 0, -1)),
+    ]
+    for levels, expected in test_cases:
+        assert evaluate_report(levels) == expected
+        assert evaluate_report(tuple(levels)) == expected
+        assert evaluate_report(numpy.array(levels, dtype=int)) == expected
+    assert evaluate_report([1, 2, 3]).is_safe
+    assert not evaluate_report([1, 2, 2]).is_safe
+
+    # Match the separate violation counters on random reports
+    rng = numpy.random.default_rng(0)
+    for _ in range(200):
+        series = pandas.Series(numpy.cumsum(rng.integers(-4, 5, size=rng.integers(0, 9))))
+        check = evaluate_report(series, min_change=1, max_change=3)
+        assert check.monotonicity_violations == get_monotonicity_violation_count(series)
+        assert check.change_violations == get_change_violation_count(series, 1, 3)
+    with pytest.raises(ValueError):
+        evaluate_report([1, 2], min_change=3, max_change=1)
+
+
+def test_count_safe_reports_parallel(file_paths, tmp_path):
+    for workers, chunks_per_worker in [(1, 1), (2, 3)]:
+        assert count_safe_reports_parallel(
+            file_paths[0], is_safe_report, workers, chunks_per_worker=chunks_per_worker
+        ) == (2, 0)
+        assert count_safe_reports_parallel(
+            file_paths[0], is_safe_with_dampener, workers, chunks_per_worker=chunks_per_worker
+        ) == (4, 0)
+        assert count_safe_reports_parallel(
+            file_paths[0], is_safe_brute_force, workers, chunks_per_worker=chunks_per_worker
+        ) == (4, 0)
+
+    short_file = tmp_path / "short_reports.tsv"
+    short_file.write_text("1\t2\t3\n\n4\n5\t9\n")
+    assert count_safe_reports_parallel(str(short_file), is_safe_report, 2) == (1, 1)
+    with pytest.raises(ValueError, match="empty"):
+        count_safe_reports_parallel(file_paths[1], is_safe_report, 2)
+    blank_file = tmp_path / "blank_reports.tsv"
+    blank_file.write_text("\n\n")
+    with pytest.raises(ValueError, match="empty"):
+        count_safe_reports_parallel(str(blank_file), is_safe_report, 2)
+    with pytest.raises(ValueError):
+        count_safe_reports_parallel(file_paths[2], is_safe_report, 2)
+    with pytest.raises(ValueError):
+        count_safe_reports_parallel(file_paths[0], is_safe_report, 0)
+
+
+def test_get_min_removals(file_paths):
+    test_cases = [
+        ([1, 2, 3, 4], 0),
+        ([1, 2, 9, 3, 4], 1),
+        ([1, 9, 2, 9, 3, 4], 2),
+        ([9, 1, 2, 3, 0, 4, 5], 2),
+        ([5, 5, 5, 5], 3),
+        ([1], 0),
+        ([], 0),
+    ]
+    for levels, expected in test_cases:
+        assert get_min_removals(levels) == expected
+        assert get_min_removals(numpy.array(levels, dtype=int)) == expected
+        assert get_min_removals(levels, max_removals=1) == min(expected, 2)
+    assert get_min_removals([1, 4, 7], min_change=3, max_change=3) == 0
+    assert get_min_removals([7, 4, 1, 2], min_change=3, max_change=3) == 1
+
+    reports = load_reports(file_paths[0])
+    assert get_min_removal_counts(reports).tolist() == [0, 2, 2, 1, 1, 0]
+    assert get_min_removal_counts(reports, max_removals=0).tolist() == [0, 1, 1, 1, 1, 0]
+
+    # Match brute force over every removal subset on random reports
+    rng = numpy.random.default_rng(0)
+    for _ in range(100):
+        levels = numpy.cumsum(rng.integers(-4, 5, size=rng.integers(2, 8))).tolist()
+        expected = next(
+            k
+            for k in range(len(levels))
+            if any(
+                is_safe_report(combo) for combo in itertools.combinations(levels, len(levels) - k)
+            )
+        )
+        assert get_min_removals(levels) == expected
+        for tolerance in range(3):
+            assert get_min_removals(levels, max_removals=tolerance) == min(expected, tolerance + 1)
+            assert is_safe_with_removals(levels, tolerance=tolerance) == (expected <= tolerance)
+        assert is_safe_with_removals(levels, tolerance=1) == is_safe_with_dampener(levels)
+
+    with pytest.raises(ValueError):
+        get_min_removals([1, 2], min_change=3, max_change=1)
+    with pytest.raises(ValueError):
+        get_min_removals([1, 2], max_removals=-1)
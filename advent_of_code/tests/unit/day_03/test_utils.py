@@ -1,4 +1,27 @@
-from advent_of_code.day_03.utils import MulStateMachine, MulState, NumState, DoState, DontState
+from advent_of_code.day_03.utils import (
+    iter_stream_totals,
+    open_stream_reader,
+    process_streams,
+    DFA_DO,
+    DFA_DONT,
+    DFA_NUM_Y,
+    MulDFA,
+    MulStateMachine,
+    MulState,
+    NumState,
+    DoState,
+    DontState,
+    process_file,
+    process_file_bytes,
+    process_file_parallel,
+    process_file_regex,
+    process_file_resumable,
+    load_checkpoint,
+    scan_chunk,
+    scan_mul_regex,
+    stitch_chunk_scans,
+)
+import asyncio
 import pathlib
 import pytest
 
@@ -164,3 +187,324 @@ def test_state_transitions(part1_state_machine, part2_state_machine):
     assert part2_state_machine.mul == 0
     assert part2_state_machine.signal == ""
     assert isinstance(part2_state_machine._state, DontState)
+
+
+def test_process_events(part1_state_machine, part2_state_machine):
+    sequence = "xmul(2,4)%&mul[3,7]!@^do_not_mul(5,5)+mul(32,64]then(mul(11,8)mul(8,5))"
+    part1_state_machine.process_events(sequence[:20])
+    part1_state_machine.process_events(sequence[20:])
+    assert part1_state_machine.mul == 161
+
+    sequence = "xmul(2,4)&mul[3,7]!^don't()_mul(5,5)+mul(32,64](mul(11,8)undo()?mul(8,5))"
+    part2_state_machine.process_events(sequence)
+    assert part2_state_machine.mul == 48
+
+    with pytest.raises(ValueError):
+        part1_state_machine.process_events("mul(12345678901234567890,1)")
+
+
+def test_signal_operands(part2_state_machine):
+    expected_signals = ["m", "mu", "mul", "mul(", "mul(0", "mul(01", "mul(01,", "mul(01,2"]
+    for ch, expected_signal in zip("mul(01,2", expected_signals):
+        part2_state_machine.process_event(ch)
+        assert part2_state_machine.signal == expected_signal
+        assert part2_state_machine.signal_length == len(expected_signal)
+    assert (part2_state_machine.x, part2_state_machine.x_digits) == (1, 2)
+    assert (part2_state_machine.y, part2_state_machine.y_digits) == (2, 1)
+    part2_state_machine.process_event("\u0663")
+    assert part2_state_machine.signal == "mul(01,23"
+    part2_state_machine.process_event(")")
+    assert part2_state_machine.mul == 23
+    for ch in "don't(":
+        part2_state_machine.process_event(ch)
+    assert part2_state_machine.signal == "don't("
+
+    part2_state_machine.set_state(NumState())
+    part2_state_machine.signal = "mul(12,3"
+    assert (part2_state_machine.x, part2_state_machine.y, part2_state_machine.x_digits) == (
+        12,
+        3,
+        2,
+    )
+    part2_state_machine.process_event(")")
+    assert part2_state_machine.mul == 23 + 36
+    assert part2_state_machine.signal == ""
+
+
+def test_enter_state(part2_state_machine):
+    do_state = part2_state_machine._state
+    for ch in "mul(1,2)":
+        part2_state_machine.process_event(ch)
+    assert part2_state_machine._state is do_state
+    part2_state_machine.enter_state(NumState)
+    assert isinstance(part2_state_machine._state, NumState)
+    assert part2_state_machine._state.context is part2_state_machine
+
+
+def test_mul_dfa():
+    sequence = "xmul(2,4)&mul[3,7]!^don't()_mul(5,5)+mul(32,64](mul(11,8)undo()?mul(8,5))"
+    dfa = MulDFA(disable_dont=False)
+    dfa.process_events(sequence)
+    assert dfa.mul == 48
+    dfa = MulDFA(disable_dont=True)
+    dfa.process_events(sequence)
+    assert dfa.mul == 161
+
+    # Partial signals carry over between blocks
+    dfa = MulDFA()
+    dfa.process_events("don't()mul(1,2)do()mul(12,3")
+    assert (dfa.state, dfa.length, dfa.x, dfa.y, dfa.mul) == (DFA_NUM_Y, 8, 12, 3, 0)
+    dfa.process_events("4)mul(\u0663,2)don't()")
+    assert (dfa.state, dfa.length, dfa.mul) == (DFA_DONT, 0, 12 * 34 + 6)
+
+    dfa = MulDFA()
+    with pytest.raises(ValueError):
+        dfa.process_events("xmul(12345678901234567890,1)")
+    assert dfa.consumed == 22
+    assert dfa.length == 21
+
+
+def test_process_events_matches_process_event():
+    sequences = [
+        "mmul(2,3)mul(1,mul(2,3))mul(4,5)",
+        "ddon't()mul(2,3)don't()ddo()mul(2,3)do()mul(2,3)",
+        "mul(00\u0663,2)mul(1,2dmul(1,2)don't(do()mul(3,3)",
+        "mul(1,2,3)mul(,2)mul(1,)mul(1,2))mul ( 1,2)",
+    ]
+    for disable_dont in [False, True]:
+        for sequence in sequences:
+            expected = MulStateMachine(disable_dont)
+            for ch in sequence:
+                expected.process_event(ch)
+            for split in range(len(sequence) + 1):
+                state_machine = MulStateMachine(disable_dont)
+                state_machine.process_events(sequence[:split])
+                for ch in sequence[split : split + 3]:
+                    state_machine.process_event(ch)
+                state_machine.process_events(sequence[split + 3 :])
+                assert state_machine.mul == expected.mul
+                assert state_machine.signal == expected.signal
+                assert type(state_machine._state) is type(expected._state)
+
+
+def test_process_bytes(part1_state_machine, part2_state_machine):
+    sequence = b"xmul(2,4)%&mul[3,7]!@^do_not_mul(5,5)+mul(32,64]then(mul(11,8)mul(8,5))"
+    part1_state_machine.process_bytes(sequence[:20])
+    part1_state_machine.process_bytes(memoryview(sequence)[20:])
+    assert part1_state_machine.mul == 161
+
+    sequence = b"xmul(2,4)&mul[3,7]!^don't()_mul(5,5)+mul(32,64](mul(11,8)undo()?mul(8,5))"
+    part2_state_machine.process_bytes(bytearray(sequence))
+    assert part2_state_machine.mul == 48
+
+    # Signals carry over between bytes and characters, and non-ASCII bytes are not digits
+    state_machine = MulStateMachine()
+    state_machine.process_bytes(b"mul(12,")
+    assert state_machine.signal == "mul(12,"
+    state_machine.process_events("3)")
+    state_machine.process_bytes("mul(\u0663,2)mul(\u00e9,2)mul(2,2)".encode("utf-8"))
+    assert state_machine.mul == 36 + 4
+    assert isinstance(state_machine._state, DoState)
+
+    with pytest.raises(ValueError):
+        part1_state_machine.process_bytes(b"mul(12345678901234567890,1)")
+    assert part1_state_machine.signal == "mul(12345678901234567"
+
+
+def test_process_file(file_paths):
+    for buffer_size in [1, 7, 1 << 20]:
+        state_machine = MulStateMachine(disable_dont=True)
+        assert process_file(state_machine, file_paths[0], buffer_size) == 161
+        assert process_file(MulStateMachine(), file_paths[1], buffer_size) == 0
+        assert process_file(MulStateMachine(), file_paths[2], buffer_size) == 0
+    with pytest.raises(ValueError):
+        process_file(MulStateMachine(), f"{SCRIPT_DIR}/data/oversized_mul_data.tsv")
+    with pytest.raises(FileNotFoundError):
+        process_file(MulStateMachine(), file_paths[4])
+    with pytest.raises(ValueError):
+        process_file(MulStateMachine(), file_paths[0], buffer_size=0)
+
+
+def test_process_file_bytes(file_paths):
+    for buffer_size in [1, 7, 1 << 20]:
+        state_machine = MulStateMachine(disable_dont=True)
+        assert process_file_bytes(state_machine, file_paths[0], buffer_size) == 161
+        assert process_file_bytes(MulStateMachine(), file_paths[1], buffer_size) == 0
+        assert process_file_bytes(MulStateMachine(), file_paths[2], buffer_size) == 0
+    with pytest.raises(ValueError):
+        process_file_bytes(MulStateMachine(), f"{SCRIPT_DIR}/data/oversized_mul_data.tsv")
+    with pytest.raises(FileNotFoundError):
+        process_file_bytes(MulStateMachine(), file_paths[4])
+
+
+def test_to_dict_from_dict(part2_state_machine):
+    part2_state_machine.process_events("mul(2,3)don't()do()mul(12,3")
+    data = part2_state_machine.to_dict()
+    assert data == {"state": "NumState", "signal": "mul(12,3", "mul": 6, "disable_dont": False}
+    state_machine = MulStateMachine.from_dict(data)
+    state_machine.process_events("4)")
+    assert state_machine.mul == 6 + 12 * 34
+    with pytest.raises(ValueError):
+        MulStateMachine.from_dict({**data, "state": "AbstractState"})
+
+
+def test_process_file_resumable(tmp_path):
+    data_file = tmp_path / "log.tsv"
+    state_file = str(tmp_path / "state.json")
+    data_file.write_bytes(b"mul(2,3)don't()mul(1,1)do()mul(1")
+    assert process_file_resumable(str(data_file), state_file) == (6, 0)
+
+    # Appended bytes complete the partial signal, including a split multi-byte character
+    with open(data_file, "ab") as fh:
+        fh.write("0,5)x\u0663".encode("utf-8")[:-1])
+    assert process_file_resumable(str(data_file), state_file, buffer_size=3) == (56, 32)
+    with open(data_file, "ab") as fh:
+        fh.write("mul(1,1)\u0663".encode("utf-8")[-1:] + b"mul(2,2)")
+    assert process_file_resumable(str(data_file), state_file) == (60, 37)
+    assert process_file_resumable(str(data_file), state_file) == (60, 47)
+
+    # A mismatched mode, truncation or rotation falls back to a full rescan
+    assert load_checkpoint(state_file, str(data_file), disable_dont=True) is None
+    assert process_file_resumable(str(data_file), state_file, disable_dont=True) == (61, 0)
+    data_file.write_bytes(b"mul(3,3)")
+    assert process_file_resumable(str(data_file), state_file, disable_dont=True) == (9, 0)
+    data_file.write_bytes(b"mul(4,4)xyz")
+    assert process_file_resumable(str(data_file), state_file, disable_dont=True) == (16, 0)
+
+    with pytest.raises(FileNotFoundError):
+        process_file_resumable(str(tmp_path / "missing.tsv"), state_file)
+
+
+def test_iter_stream_totals():
+    async def collect(blocks: list[bytes]) -> list[int]:
+        reader = asyncio.StreamReader()
+        for block in blocks:
+            reader.feed_data(block)
+        reader.feed_eof()
+        return [total async for total in iter_stream_totals(reader, buffer_size=4)]
+
+    totals = asyncio.run(collect([b"mul(2,", b"3)don't()mul(5,5)", "do()mul(\u0663,1)".encode()]))
+    assert totals[-1] == 9
+    assert totals == sorted(totals)
+    assert asyncio.run(collect([])) == [0]
+    with pytest.raises(ValueError):
+        asyncio.run(collect([b"mul(12345678901234567890,1)"]))
+
+
+def test_process_streams(tmp_path):
+    sequence = b"xmul(2,4)&mul[3,7]!^don't()_mul(5,5)+mul(32,64](mul(11,8)undo()?mul(8,5))"
+    socket_path = str(tmp_path / "mul.sock")
+
+    async def serve(reader, writer) -> None:
+        for i in range(0, len(sequence), 5):
+            writer.write(sequence[i : i + 5])
+            await writer.drain()
+        writer.close()
+
+    async def run() -> tuple[list[int], list[tuple[int, int]]]:
+        server = await asyncio.start_unix_server(serve, socket_path)
+        async with server:
+            streams = [await open_stream_reader(f"unix:{socket_path}") for _ in range(3)]
+            fed_reader = asyncio.StreamReader()
+            fed_reader.feed_data(b"mul(3,3)")
+            fed_reader.feed_eof()
+            updates = []
+            totals = await process_streams(
+                [reader for reader, _ in streams] + [fed_reader],
+                buffer_size=5,
+                on_total=lambda i, t: updates.append((i, t)),
+                handles=[handle for _, handle in streams] + [None],
+            )
+            assert all(handle.is_closing() for _, handle in streams)
+        return totals, updates
+
+    totals, updates = asyncio.run(run())
+    assert totals == [48, 48, 48, 9]
+    assert {index for index, _ in updates} == {0, 1, 2, 3}
+    assert (3, 9) in updates
+
+    # Regular files are not pipes, and the file opened for them is closed again
+    regular_file = tmp_path / "mul.tsv"
+    regular_file.write_bytes(sequence)
+    with pytest.raises(ValueError):
+        asyncio.run(open_stream_reader(str(regular_file)))
+
+
+def test_stitch_chunk_scans():
+    sequences = [
+        "xmul(2,4)&mul[3,7]!^don't()_mul(5,5)+mul(32,64](mul(11,8)undo()?mul(8,5))",
+        "mul(12,34)mul(5,6)don't()do()mul(7,8)xdo()mul(1,1)",
+        "mul(1,mul(2,3))ddo()x;mul(123,4",
+    ]
+    for disable_dont in [False, True]:
+        for sequence in sequences:
+            state_machine = MulStateMachine(disable_dont)
+            state_machine.process_events(sequence)
+            # Every pair of cut points, so tokens straddle chunk boundaries
+            for i in range(len(sequence) + 1):
+                for j in range(i, len(sequence) + 1):
+                    chunks = [sequence[:i], sequence[i:j], sequence[j:]]
+                    scans = [scan_chunk(chunk, disable_dont, block_size=4) for chunk in chunks]
+                    assert stitch_chunk_scans(scans, disable_dont) == state_machine.mul
+
+    # Chunks without a reset character are replayed in full
+    assert scan_chunk("mul(2,3)").results == {}
+    scan = scan_chunk("mul(2,3)xmul(4,5)don't()mul(1,1)")
+    assert scan.prefix == "mul(2,3)x"
+    assert scan.results[DFA_DO][0] == 20
+    assert scan.results[DFA_DONT][0] == 0
+
+    scans = [scan_chunk("mul(1"), scan_chunk("2345678901234567890,1)")]
+    with pytest.raises(ValueError):
+        stitch_chunk_scans(scans)
+    scans = [scan_chunk("x"), scan_chunk("xmul(12345678901234567890,1)")]
+    assert scans[1].results[DFA_DO] is None
+    with pytest.raises(ValueError):
+        stitch_chunk_scans(scans)
+
+
+def test_process_file_parallel(file_paths, tmp_path):
+    for workers, chunks_per_worker in [(1, 1), (2, 8)]:
+        assert process_file_parallel(file_paths[0], True, workers, chunks_per_worker) == 161
+        assert process_file_parallel(file_paths[1], False, workers, chunks_per_worker) == 0
+        assert process_file_parallel(file_paths[2], False, workers, chunks_per_worker) == 0
+    unicode_file = tmp_path / "unicode_data.tsv"
+    unicode_file.write_text(
+        "\u00e9mul(\u0663,2)\u00e9don't()\u00e9mul(1,2)do()mul(4,\u0664)", "utf-8"
+    )
+    assert process_file_parallel(str(unicode_file), False, 2, 8) == 22
+    with pytest.raises(ValueError):
+        process_file_parallel(f"{SCRIPT_DIR}/data/oversized_mul_data.tsv", workers=2)
+    with pytest.raises(FileNotFoundError):
+        process_file_parallel(file_paths[4])
+    with pytest.raises(ValueError):
+        process_file_parallel(file_paths[0], workers=0)
+
+
+def test_scan_mul_regex():
+    sequence = b"xmul(2,4)%&mul[3,7]!@^do_not_mul(5,5)+mul(32,64]then(mul(11,8)mul(8,5))"
+    assert scan_mul_regex(sequence, disable_dont=True) == 161
+    sequence = b"xmul(2,4)&mul[3,7]!^don't()_mul(5,5)+mul(32,64](mul(11,8)undo()?mul(8,5))"
+    assert scan_mul_regex(sequence, disable_dont=False) == 48
+    assert scan_mul_regex(memoryview(sequence), disable_dont=True) == 161
+    assert scan_mul_regex(b"mul(1234567,1234567)") == 1234567 * 1234567
+
+    # Signals exceeding MAX_SIGNAL_LENGTH raise like the state machine does
+    for sequence in [b"mul(12345678901234567890,1)", b"mul(123456789,12345678901x"]:
+        with pytest.raises(ValueError):
+            scan_mul_regex(sequence)
+        with pytest.raises(ValueError):
+            MulStateMachine().process_events(sequence.decode())
+    # No event follows the oversized signal, and disabled signals are never checked
+    assert scan_mul_regex(b"mul(12345678901234567890") == 0
+    assert scan_mul_regex(b"don't()mul(12345678901234567890,1)") == 0
+
+
+def test_process_file_regex(file_paths):
+    assert process_file_regex(file_paths[0], disable_dont=True) == 161
+    assert process_file_regex(file_paths[1]) == 0
+    assert process_file_regex(file_paths[2]) == 0
+    with pytest.raises(ValueError):
+        process_file_regex(f"{SCRIPT_DIR}/data/oversized_mul_data.tsv")
+    with pytest.raises(FileNotFoundError):
+        process_file_regex(file_paths[4])
@@ -1,4 +1,11 @@
-from advent_of_code.day_04.utils import Puzzle
+from advent_of_code.day_04.utils import (
+    X_MAS_STENCIL,
+    Puzzle,
+    WordAutomaton,
+    WordMatch,
+    stencil_symmetries,
+)
+import numpy
 import pandas
 import pathlib
 import pytest
@@ -33,9 +40,35 @@ def puzzle_sets(file_paths):
     puzzle = Puzzle.__new__(Puzzle)
     puzzle.puzzle = data
     puzzles["abc_puzzle"] = puzzle
+    grid_puzzle = Puzzle.__new__(Puzzle)
+    grid_puzzle.puzzle = numpy.array([[ord(ch) for ch in row] for row in data.values], numpy.uint8)
+    puzzles["abc_grid_puzzle"] = grid_puzzle
+    puzzles["example_grid_puzzle"] = Puzzle(file_paths["example_puzzle"], backend="numpy")
     return puzzles
 
 
+def test_load_grid(file_paths, puzzle_sets, tmp_path):
+    expected = puzzle_sets["example_puzzle"].puzzle.to_numpy()
+    for memmap in [False, True]:
+        puzzle = Puzzle(file_paths["example_puzzle"], backend="numpy", memmap=memmap)
+        assert puzzle.puzzle.dtype == numpy.uint8
+        assert puzzle.puzzle.shape == (10, 10)
+        assert (puzzle.puzzle == expected.astype("S1").view(numpy.uint8)).all()
+        assert Puzzle(file_paths["empty_puzzle"], "numpy", memmap).puzzle.shape == (0, 0)
+
+    for content in ["ABC\nDEF\n", "ABC\nDEF", "ABC\r\nDEF\r\n", "ABC\r\nDEF"]:
+        puzzle_file = tmp_path / "puzzle.tsv"
+        puzzle_file.write_bytes(content.encode())
+        puzzle = Puzzle(puzzle_file, backend="numpy")
+        assert puzzle.puzzle.tobytes() == b"ABCDEF"
+        assert puzzle._get_southeast(0, 0, 2) == "AE"
+    puzzle_file.write_bytes(b"ABC\nDE\nFGH\n")
+    with pytest.raises(ValueError):
+        Puzzle(puzzle_file, backend="numpy")
+    with pytest.raises(ValueError):
+        Puzzle(puzzle_file, backend="arrow")
+
+
 def test_char_search(puzzle_sets):
     puzzle = puzzle_sets["example_puzzle"]
     row_indices, col_indices = puzzle.char_search("X")
@@ -49,6 +82,29 @@ def test_char_search(puzzle_sets):
     assert len(row_indices) == 0
     assert len(col_indices) == 0
 
+    grid_indices = puzzle_sets["example_grid_puzzle"].char_search("X")
+    expected_indices = puzzle_sets["example_puzzle"].char_search("X")
+    assert all(numpy.array_equal(a, b) for a, b in zip(grid_indices, expected_indices))
+
+    for name in ["example_puzzle", "example_grid_puzzle"]:
+        row_indices, col_indices = puzzle_sets[name].char_search("")
+        assert len(row_indices) == 0
+        assert len(col_indices) == 0
+
+
+def test_grid_readers(puzzle_sets):
+    puzzle = puzzle_sets["abc_puzzle"]
+    grid_puzzle = puzzle_sets["abc_grid_puzzle"]
+    directions = ["north", "south", "east", "west", "northeast", "northwest", "southeast"]
+    for direction in directions + ["southwest"]:
+        for row in range(5):
+            for col in range(3):
+                for length in range(6):
+                    expected = getattr(puzzle, f"_get_{direction}")(row, col, length)
+                    assert getattr(grid_puzzle, f"_get_{direction}")(row, col, length) == expected
+        with pytest.raises(IndexError):
+            getattr(grid_puzzle, f"_get_{direction}")(5, 0, 2)
+
 
 def test_get_north(puzzle_sets):
     puzzle = puzzle_sets["abc_puzzle"]
@@ -122,8 +178,123 @@ def test_get_word_count(puzzle_sets):
         found_count += puzzle.get_word_count("XMAS", row, col)
     assert found_count == 18, f"The word 'XMAS' was found {found_count}/18 times."
 
+    puzzle = puzzle_sets["example_grid_puzzle"]
+    row_indices, col_indices = puzzle.char_search("X")
+    found_count = sum(
+        puzzle.get_word_count("XMAS", row, col) for row, col in zip(row_indices, col_indices)
+    )
+    assert found_count == 18, f"The word 'XMAS' was found {found_count}/18 times."
+
+
+def test_count_word(puzzle_sets, tmp_path):
+    for name in ["example_puzzle", "example_grid_puzzle"]:
+        assert puzzle_sets[name].count_word("XMAS") == 18
+        assert puzzle_sets[name].count_word("") == 0
+        assert puzzle_sets[name].count_word("XMASXMASXMAS") == 0
+    assert puzzle_sets["no_xmas_puzzle"].count_word("XMAS") == 0
+    assert puzzle_sets["empty_puzzle"].count_word("XMAS") == 0
+
+    # Matches the per-position count, including single letters and palindromes
+    rng = numpy.random.default_rng(4)
+    puzzle_file = tmp_path / "puzzle.tsv"
+    puzzle_file.write_text("\n".join("".join(rng.choice(list("AB"), 7)) for _ in range(5)))
+    for backend in ["pandas", "numpy"]:
+        puzzle = Puzzle(puzzle_file, backend=backend)
+        for word in ["A", "AB", "ABA", "BAAB", "ABBBA"]:
+            expected = sum(
+                puzzle.get_word_count(word, row, col) for row in range(5) for col in range(7)
+            )
+            assert puzzle.count_word(word) == expected
+
 
 def test_get_x_mas_count(puzzle_sets):
     puzzle = puzzle_sets["example_puzzle"]
     found_count = puzzle.get_x_mas_count()
     assert found_count == 9, f"X-shaped 'MAS' was found {found_count}/9 times."
+
+    found_count = puzzle_sets["example_grid_puzzle"].get_x_mas_count()
+    assert found_count == 9, f"X-shaped 'MAS' was found {found_count}/9 times."
+
+
+def test_stencil_symmetries():
+    assert stencil_symmetries(X_MAS_STENCIL) == [
+        ("M.S", ".A.", "M.S"),
+        ("S.M", ".A.", "S.M"),
+        ("M.M", ".A.", "S.S"),
+        ("S.S", ".A.", "M.M"),
+    ]
+    assert stencil_symmetries(["AB"], reflections=False) == [
+        ("AB",),
+        ("A", "B"),
+        ("BA",),
+        ("B", "A"),
+    ]
+    assert stencil_symmetries(["A", "BC"])[0] == ("A.", "BC")
+    assert stencil_symmetries(["A"]) == [("A",)]
+
+
+def test_match_stencil(puzzle_sets, tmp_path):
+    for name in ["abc_puzzle", "abc_grid_puzzle"]:
+        puzzle = puzzle_sets[name]
+        mask = puzzle.match_stencil(["B.", ".F"])
+        assert mask.shape == (5, 3)
+        assert list(zip(*numpy.nonzero(mask))) == [(0, 1)]
+        assert not puzzle.match_stencil(["ABCD"]).any()
+        assert puzzle.count_stencils([["E"], ["E.", ".I"], ["D"]]) == 3
+        assert puzzle.count_stencils([]) == 0
+        with pytest.raises(ValueError):
+            puzzle.match_stencil(["..", "."])
+
+    # Variants anchored at the same corner are all counted, like the matches of `count_word`
+    puzzle_file = tmp_path / "puzzle.tsv"
+    puzzle_file.write_text("AB\nBA")
+    for backend in ["pandas", "numpy"]:
+        puzzle = Puzzle(puzzle_file, backend=backend)
+        assert puzzle.count_stencils(stencil_symmetries(["AB"])) == 4 == puzzle.count_word("AB")
+        assert puzzle.count_stencils(stencil_symmetries(["A.", ".A"])) == 1
+
+
+def test_word_automaton():
+    automaton = WordAutomaton(["he", "she", "his", "hers", "", "he"])
+    assert automaton.words == ["he", "she", "his", "hers"]
+    matches = sorted(automaton.iter_matches("ushers"))
+    assert matches == [(0, 2), (1, 1), (3, 2)]
+    assert list(WordAutomaton(["aa"]).iter_matches("aaaa")) == [(0, 0), (0, 1), (0, 2)]
+
+
+def test_count_words(puzzle_sets, tmp_path):
+    words = ["XMAS", "SAMX", "MAS", "X", "XMASXMASXMAS", "", "XMAS"]
+    for name in ["example_puzzle", "example_grid_puzzle", "no_xmas_puzzle", "empty_puzzle"]:
+        puzzle = puzzle_sets[name]
+        counts = puzzle.count_words(words)
+        assert list(counts) == ["XMAS", "SAMX", "MAS", "X", "XMASXMASXMAS", ""]
+        assert counts == {word: puzzle.count_word(word) for word in counts}
+    assert puzzle_sets["example_puzzle"].count_words(["XMAS"]) == {"XMAS": 18}
+
+    # Non-square grids, overlapping words and palindromes match the shifted-slice count
+    rng = numpy.random.default_rng(5)
+    puzzle_file = tmp_path / "puzzle.tsv"
+    puzzle_file.write_text("\n".join("".join(rng.choice(list("AB"), 4)) for _ in range(6)))
+    for backend in ["pandas", "numpy"]:
+        puzzle = Puzzle(puzzle_file, backend=backend)
+        words = ["A", "AB", "BA", "ABA", "AAB", "BBBB", "ABABAB"]
+        assert puzzle.count_words(words) == {word: puzzle.count_word(word) for word in words}
+
+
+def test_find_words(puzzle_sets):
+    for name in ["abc_puzzle", "abc_grid_puzzle"]:
+        matches = puzzle_sets[name].find_words(["AEI", "CEG", "MJ", "FE", "ZZ"])
+        assert matches == {
+            "AEI": [WordMatch(0, 0, 1, 1)],
+            "CEG": [WordMatch(0, 2, 1, -1)],
+            "MJ": [WordMatch(4, 0, -1, 0)],
+            "FE": [WordMatch(1, 2, 0, -1)],
+            "ZZ": [],
+        }
+
+    puzzle = puzzle_sets["example_grid_puzzle"]
+    for word, word_matches in puzzle.find_words(["XMAS", "MAS"]).items():
+        assert len(word_matches) == puzzle.count_word(word)
+        for row, col, row_step, col_step in word_matches:
+            for i, char in enumerate(word):
+                assert puzzle.puzzle[row + row_step * i, col + col_step * i] == ord(char)